@@ -1,4 +1,7 @@
 import asyncio
+import os
+import sys
+
 from alembic import context
 from sqlalchemy import pool
 from sqlalchemy.engine import Connection
@@ -10,6 +13,9 @@ from app.models import Folder, Note, User
 
 config = context.config
 
+# Version scripts import shared helpers from migration_helpers.py next to this file
+sys.path.insert(0, os.path.dirname(__file__))
+
 config.set_main_option("sqlalchemy.url", settings.database_url)
 
 target_metadata = Base.metadata
@@ -49,6 +55,11 @@ async def run_async_migrations() -> None:
 
 
 def run_migrations_online() -> None:
+    # The app passes a connection of its own AsyncEngine (see app.main); the CLI builds its own engine
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        do_run_migrations(connection)
+        return
     asyncio.run(run_async_migrations())
 
 
@@ -0,0 +1,20 @@
+"""Helpers shared by version scripts; alembic/env.py puts this directory on sys.path."""
+
+import sqlalchemy as sa
+from alembic import op
+
+# A failed CREATE INDEX CONCURRENTLY leaves an INVALID index behind that if_not_exists would keep
+INVALID_INDEX_SQL = """
+    SELECT 1
+    FROM pg_index i
+    JOIN pg_class c ON c.oid = i.indexrelid
+    WHERE c.relname = :name
+      AND c.relnamespace = current_schema()::regnamespace
+      AND NOT i.indisvalid
+"""
+
+
+def drop_invalid_index(name: str) -> None:
+    """Drop index `name` if it is INVALID; call inside autocommit_block() before a concurrent build."""
+    if op.get_bind().execute(sa.text(INVALID_INDEX_SQL), {"name": name}).scalar():
+        op.drop_index(name, postgresql_concurrently=True)
@@ -16,17 +16,48 @@ branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
+BATCH_SIZE = 10_000
+
+
 def upgrade() -> None:
-    # Delete duplicates: keep row with smallest id per (user_id, lower(trim(fact)))
-    op.execute(sa.text("""
-        DELETE FROM user_profile_facts AS f1
-        WHERE EXISTS (
-            SELECT 1 FROM user_profile_facts AS f2
-            WHERE f1.user_id = f2.user_id
-              AND LOWER(TRIM(f1.fact)) = LOWER(TRIM(f2.fact))
-              AND f1.id > f2.id
-        )
-    """))
+    # Delete duplicates: keep row with smallest id per (user_id, lower(btrim(fact))).
+    # Duplicate ids are found in one row_number() pass, then deleted in committed
+    # batches so a large table never turns into one huge transaction.
+    with op.get_context().autocommit_block():
+        conn = op.get_bind()
+        conn.execute(sa.text("SET work_mem = '256MB'"))
+        conn.execute(sa.text("""
+            CREATE TEMP TABLE dup_ids AS
+            SELECT id FROM (
+                SELECT id,
+                       row_number() OVER (
+                           PARTITION BY user_id, lower(btrim(fact)) ORDER BY id
+                       ) AS rn
+                FROM user_profile_facts
+            ) AS x
+            WHERE rn > 1
+        """))
+        conn.execute(sa.text("ALTER TABLE dup_ids ADD PRIMARY KEY (id)"))
+        conn.execute(sa.text("RESET work_mem"))
+        while True:
+            deleted = conn.execute(
+                sa.text("""
+                    WITH batch AS (
+                        DELETE FROM dup_ids
+                        WHERE id IN (SELECT id FROM dup_ids LIMIT :batch_size)
+                        RETURNING id
+                    ), gone AS (
+                        DELETE FROM user_profile_facts AS u
+                        USING batch
+                        WHERE u.id = batch.id
+                    )
+                    SELECT count(*) FROM batch
+                """),
+                {"batch_size": BATCH_SIZE},
+            ).scalar_one()
+            if not deleted:
+                break
+        conn.execute(sa.text("DROP TABLE dup_ids"))
 
 
 def downgrade() -> None:
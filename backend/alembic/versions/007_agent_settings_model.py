@@ -8,7 +8,6 @@ Create Date: 2025-02-17
 from typing import Sequence, Union
 
 from alembic import op
-import sqlalchemy as sa
 
 
 revision: str = "007"
@@ -18,12 +17,16 @@ depends_on: Union[str, Sequence[str], None] = None
 
 
 def upgrade() -> None:
-    op.add_column("agent_settings", sa.Column("base_url", sa.String(512), nullable=True))
-    op.add_column("agent_settings", sa.Column("model", sa.String(256), nullable=True))
-    op.add_column("agent_settings", sa.Column("api_key", sa.String(512), nullable=True))
+    # Один ALTER TABLE вместо трёх: одна блокировка и одна запись в каталог
+    op.execute(
+        "ALTER TABLE agent_settings "
+        "ADD COLUMN base_url varchar(512), "
+        "ADD COLUMN model varchar(256), "
+        "ADD COLUMN api_key varchar(512)"
+    )
 
 
 def downgrade() -> None:
-    op.drop_column("agent_settings", "api_key")
-    op.drop_column("agent_settings", "model")
-    op.drop_column("agent_settings", "base_url")
+    op.execute(
+        "ALTER TABLE agent_settings DROP COLUMN api_key, DROP COLUMN model, DROP COLUMN base_url"
+    )
@@ -8,8 +8,6 @@ Create Date: 2025-02-18
 from typing import Sequence, Union
 
 from alembic import op
-import sqlalchemy as sa
-from sqlalchemy.dialects import postgresql
 
 
 revision: str = "009"
@@ -19,12 +17,13 @@ depends_on: Union[str, Sequence[str], None] = None
 
 
 def upgrade() -> None:
-    op.add_column("notes", sa.Column("is_task", sa.Boolean(), nullable=False, server_default="false"))
-    op.add_column("notes", sa.Column("subtasks", postgresql.JSONB(), nullable=True))
-    op.add_column("notes", sa.Column("completed_at", sa.DateTime(), nullable=True))
+    op.execute(
+        "ALTER TABLE notes "
+        "ADD COLUMN is_task boolean NOT NULL DEFAULT false, "
+        "ADD COLUMN subtasks jsonb, "
+        "ADD COLUMN completed_at timestamp without time zone"
+    )
 
 
 def downgrade() -> None:
-    op.drop_column("notes", "completed_at")
-    op.drop_column("notes", "subtasks")
-    op.drop_column("notes", "is_task")
+    op.execute("ALTER TABLE notes DROP COLUMN completed_at, DROP COLUMN subtasks, DROP COLUMN is_task")
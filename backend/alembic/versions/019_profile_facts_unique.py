@@ -0,0 +1,54 @@
+"""Add unique index on user_profile_facts (user_id, lower(btrim(fact)))
+
+Revision ID: 019
+Revises: 018
+Create Date: 2026-10-15
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migration_helpers import drop_invalid_index
+
+
+revision: str = "019"
+down_revision: Union[str, None] = "018"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Duplicates may have reappeared since 004; the index cannot be built over them.
+    op.execute(sa.text("""
+        WITH d AS (
+            SELECT id,
+                   row_number() OVER (
+                       PARTITION BY user_id, lower(btrim(fact)) ORDER BY id
+                   ) AS rn
+            FROM user_profile_facts
+        )
+        DELETE FROM user_profile_facts AS u
+        USING d
+        WHERE u.id = d.id AND d.rn > 1
+    """))
+    with op.get_context().autocommit_block():
+        drop_invalid_index("uq_upf_user_normfact")
+        op.create_index(
+            "uq_upf_user_normfact",
+            "user_profile_facts",
+            ["user_id", sa.text("lower(btrim(fact))")],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "uq_upf_user_normfact",
+            table_name="user_profile_facts",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
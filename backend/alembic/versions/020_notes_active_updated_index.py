@@ -0,0 +1,42 @@
+"""Add partial index notes(user_id, updated_at DESC) WHERE deleted_at IS NULL
+
+Revision ID: 020
+Revises: 019
+Create Date: 2026-10-15
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migration_helpers import drop_invalid_index
+
+
+revision: str = "020"
+down_revision: Union[str, None] = "019"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        drop_invalid_index("ix_notes_user_active_updated")
+        op.create_index(
+            "ix_notes_user_active_updated",
+            "notes",
+            ["user_id", sa.text("updated_at DESC")],
+            unique=False,
+            postgresql_where=sa.text("deleted_at IS NULL"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_notes_user_active_updated",
+            table_name="notes",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,57 @@
+"""Replace ix_notes_deadline with partial index notes(user_id, deadline) for tasks
+
+Revision ID: 021
+Revises: 020
+Create Date: 2026-10-15
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migration_helpers import drop_invalid_index
+
+
+revision: str = "021"
+down_revision: Union[str, None] = "020"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        drop_invalid_index("ix_notes_user_task_deadline")
+        op.create_index(
+            "ix_notes_user_task_deadline",
+            "notes",
+            ["user_id", "deadline"],
+            unique=False,
+            postgresql_where=sa.text("is_task = true AND deleted_at IS NULL"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            op.f("ix_notes_deadline"),
+            table_name="notes",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        drop_invalid_index(op.f("ix_notes_deadline"))
+        op.create_index(
+            op.f("ix_notes_deadline"),
+            "notes",
+            ["deadline"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_notes_user_task_deadline",
+            table_name="notes",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,42 @@
+"""Add partial index notes(user_id, updated_at DESC) for pinned notes
+
+Revision ID: 022
+Revises: 021
+Create Date: 2026-10-15
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migration_helpers import drop_invalid_index
+
+
+revision: str = "022"
+down_revision: Union[str, None] = "021"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        drop_invalid_index("ix_notes_pinned_user")
+        op.create_index(
+            "ix_notes_pinned_user",
+            "notes",
+            ["user_id", sa.text("updated_at DESC")],
+            unique=False,
+            postgresql_where=sa.text("pinned = true AND deleted_at IS NULL"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_notes_pinned_user",
+            table_name="notes",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
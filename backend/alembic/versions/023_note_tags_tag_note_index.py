@@ -0,0 +1,56 @@
+"""Replace ix_note_tags_tag_id with composite note_tags(tag_id, note_id)
+
+Revision ID: 023
+Revises: 022
+Create Date: 2026-10-15
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from migration_helpers import drop_invalid_index
+
+
+revision: str = "023"
+down_revision: Union[str, None] = "022"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # PK (note_id, tag_id) covers the note side; this covers the tag side index-only.
+    with op.get_context().autocommit_block():
+        drop_invalid_index("ix_note_tags_tag_note")
+        op.create_index(
+            "ix_note_tags_tag_note",
+            "note_tags",
+            ["tag_id", "note_id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            op.f("ix_note_tags_tag_id"),
+            table_name="note_tags",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        drop_invalid_index(op.f("ix_note_tags_tag_id"))
+        op.create_index(
+            op.f("ix_note_tags_tag_id"),
+            "note_tags",
+            ["tag_id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_note_tags_tag_note",
+            table_name="note_tags",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
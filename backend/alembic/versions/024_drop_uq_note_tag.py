@@ -0,0 +1,23 @@
+"""Drop uq_note_tag: duplicates the note_tags (note_id, tag_id) primary key
+
+Revision ID: 024
+Revises: 023
+Create Date: 2026-10-15
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "024"
+down_revision: Union[str, None] = "023"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_constraint("uq_note_tag", "note_tags", type_="unique")
+
+
+def downgrade() -> None:
+    op.create_unique_constraint("uq_note_tag", "note_tags", ["note_id", "tag_id"])
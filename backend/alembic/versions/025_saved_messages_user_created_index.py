@@ -0,0 +1,62 @@
+"""Replace uq_saved_message_time with non-unique saved_messages(user_id, created_at DESC)
+
+Revision ID: 025
+Revises: 024
+Create Date: 2026-10-15
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migration_helpers import drop_invalid_index
+
+
+revision: str = "025"
+down_revision: Union[str, None] = "024"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        drop_invalid_index("ix_saved_messages_user_created")
+        op.create_index(
+            "ix_saved_messages_user_created",
+            "saved_messages",
+            ["user_id", sa.text("created_at DESC")],
+            unique=False,
+            postgresql_where=sa.text("deleted_at IS NULL"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+    # Two saves with the same timestamp (bulk import, bot bursts) must not fail.
+    op.drop_constraint("uq_saved_message_time", "saved_messages", type_="unique")
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            op.f("ix_saved_messages_created_at"),
+            table_name="saved_messages",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        drop_invalid_index(op.f("ix_saved_messages_created_at"))
+        op.create_index(
+            op.f("ix_saved_messages_created_at"),
+            "saved_messages",
+            ["created_at"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+    op.create_unique_constraint("uq_saved_message_time", "saved_messages", ["user_id", "created_at"])
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_saved_messages_user_created",
+            table_name="saved_messages",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,39 @@
+"""Convert chat_messages.tool_calls from json to jsonb
+
+Revision ID: 026
+Revises: 025
+Create Date: 2026-10-15
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "026"
+down_revision: Union[str, None] = "025"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.alter_column(
+        "chat_messages",
+        "tool_calls",
+        type_=postgresql.JSONB(),
+        existing_type=sa.JSON(),
+        existing_nullable=True,
+        postgresql_using="tool_calls::jsonb",
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        "chat_messages",
+        "tool_calls",
+        type_=sa.JSON(),
+        existing_type=postgresql.JSONB(),
+        existing_nullable=True,
+        postgresql_using="tool_calls::json",
+    )
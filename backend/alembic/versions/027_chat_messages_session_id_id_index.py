@@ -0,0 +1,56 @@
+"""Replace ix_chat_messages_session_id with covering chat_messages(session_id, id)
+
+Revision ID: 027
+Revises: 026
+Create Date: 2026-10-15
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from migration_helpers import drop_invalid_index
+
+
+revision: str = "027"
+down_revision: Union[str, None] = "026"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        drop_invalid_index("ix_chat_messages_session_id_id")
+        op.create_index(
+            "ix_chat_messages_session_id_id",
+            "chat_messages",
+            ["session_id", "id"],
+            unique=False,
+            postgresql_include=["role", "created_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_chat_messages_session_id",
+            table_name="chat_messages",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        drop_invalid_index("ix_chat_messages_session_id")
+        op.create_index(
+            "ix_chat_messages_session_id",
+            "chat_messages",
+            ["session_id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_chat_messages_session_id_id",
+            table_name="chat_messages",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
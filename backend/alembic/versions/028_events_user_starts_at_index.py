@@ -0,0 +1,70 @@
+"""Replace events user_id/starts_at singleton indexes with composite (user_id, starts_at)
+
+Revision ID: 028
+Revises: 027
+Create Date: 2026-10-15
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from migration_helpers import drop_invalid_index
+
+
+revision: str = "028"
+down_revision: Union[str, None] = "027"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        drop_invalid_index("ix_events_user_starts_at")
+        op.create_index(
+            "ix_events_user_starts_at",
+            "events",
+            ["user_id", "starts_at"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            op.f("ix_events_starts_at"),
+            table_name="events",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            op.f("ix_events_user_id"),
+            table_name="events",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        drop_invalid_index(op.f("ix_events_user_id"))
+        op.create_index(
+            op.f("ix_events_user_id"),
+            "events",
+            ["user_id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        drop_invalid_index(op.f("ix_events_starts_at"))
+        op.create_index(
+            op.f("ix_events_starts_at"),
+            "events",
+            ["starts_at"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_events_user_starts_at",
+            table_name="events",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,46 @@
+"""Widen high-volume primary keys (and foreign keys to notes.id) to bigint
+
+Revision ID: 030
+Revises: 029
+Create Date: 2026-10-15
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "030"
+down_revision: Union[str, None] = "029"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PK_TABLES = ("notes", "chat_messages", "note_versions", "saved_messages", "events")
+
+NOTE_FK_COLUMNS = (
+    ("events", "note_id"),
+    ("note_tags", "note_id"),
+    ("note_links", "source_note_id"),
+    ("note_links", "target_note_id"),
+    ("note_versions", "note_id"),
+)
+
+
+def _alter_ids(from_type: sa.types.TypeEngine, to_type: sa.types.TypeEngine, seq_type: str) -> None:
+    conn = op.get_bind()
+    for table in PK_TABLES:
+        op.alter_column(table, "id", type_=to_type, existing_type=from_type, existing_nullable=False)
+        seq = conn.execute(sa.text("SELECT pg_get_serial_sequence(:t, 'id')"), {"t": table}).scalar()
+        if seq:
+            op.execute(f"ALTER SEQUENCE {seq} AS {seq_type}")
+    for table, column in NOTE_FK_COLUMNS:
+        op.alter_column(table, column, type_=to_type, existing_type=from_type, existing_nullable=False)
+
+
+def upgrade() -> None:
+    _alter_ids(sa.Integer(), sa.BigInteger(), "bigint")
+
+
+def downgrade() -> None:
+    _alter_ids(sa.BigInteger(), sa.Integer(), "integer")
@@ -0,0 +1,82 @@
+"""Use timestamptz with DEFAULT now() for created_at/updated_at; timestamptz for other timestamps
+
+Revision ID: 031
+Revises: 030
+Create Date: 2026-10-15
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "031"
+down_revision: Union[str, None] = "030"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, column): filled by the database, NOT NULL
+DEFAULTED_COLUMNS = (
+    ("users", "created_at"),
+    ("notes", "created_at"),
+    ("notes", "updated_at"),
+    ("user_profile_facts", "created_at"),
+    ("tags", "created_at"),
+    ("note_links", "created_at"),
+    ("saved_messages", "created_at"),
+    ("saved_message_categories", "created_at"),
+)
+
+# (table, column): nullable markers, only the type changes
+NULLABLE_COLUMNS = (
+    ("notes", "deleted_at"),
+    ("notes", "completed_at"),
+    ("saved_messages", "deleted_at"),
+)
+
+
+def upgrade() -> None:
+    # Stored values are naive UTC (datetime.utcnow), so interpret them as UTC.
+    for table, column in DEFAULTED_COLUMNS:
+        op.execute(f"UPDATE {table} SET {column} = now() WHERE {column} IS NULL")
+        op.alter_column(
+            table,
+            column,
+            type_=sa.DateTime(timezone=True),
+            existing_type=sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=False,
+            postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+        )
+    for table, column in NULLABLE_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=sa.DateTime(timezone=True),
+            existing_type=sa.DateTime(),
+            existing_nullable=True,
+            postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+        )
+
+
+def downgrade() -> None:
+    for table, column in NULLABLE_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=sa.DateTime(),
+            existing_type=sa.DateTime(timezone=True),
+            existing_nullable=True,
+            postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+        )
+    for table, column in DEFAULTED_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=sa.DateTime(),
+            existing_type=sa.DateTime(timezone=True),
+            server_default=None,
+            nullable=True,
+            postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+        )
@@ -0,0 +1,60 @@
+"""Maintain updated_at in the database via triggers
+
+Revision ID: 032
+Revises: 031
+Create Date: 2026-10-15
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "032"
+down_revision: Union[str, None] = "031"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TOUCHED_TABLES = ("chat_sessions", "notes")
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION touch_updated_at() RETURNS trigger AS $$
+        BEGIN
+            NEW.updated_at = now();
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in TOUCHED_TABLES:
+        op.execute(
+            f"CREATE TRIGGER trg_{table}_touch BEFORE UPDATE ON {table} "
+            "FOR EACH ROW EXECUTE FUNCTION touch_updated_at()"
+        )
+
+    # Новое сообщение «трогает» сессию на стороне БД — без отдельного UPDATE из приложения
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION touch_chat_session() RETURNS trigger AS $$
+        BEGIN
+            UPDATE chat_sessions SET updated_at = now() WHERE id = NEW.session_id;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER trg_chat_messages_touch_session AFTER INSERT ON chat_messages "
+        "FOR EACH ROW EXECUTE FUNCTION touch_chat_session()"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_chat_messages_touch_session ON chat_messages")
+    op.execute("DROP FUNCTION IF EXISTS touch_chat_session()")
+    for table in TOUCHED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_touch ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS touch_updated_at()")
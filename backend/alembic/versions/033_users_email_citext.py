@@ -0,0 +1,39 @@
+"""Make users.email case-insensitive (citext)
+
+Revision ID: 033
+Revises: 032
+Create Date: 2026-10-15
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "033"
+down_revision: Union[str, None] = "032"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS citext")
+    # Уникальный ix_users_email перестраивается вместе с колонкой и становится регистронезависимым
+    op.alter_column(
+        "users",
+        "email",
+        type_=postgresql.CITEXT(),
+        existing_type=sa.String(255),
+        existing_nullable=False,
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        "users",
+        "email",
+        type_=sa.String(255),
+        existing_type=postgresql.CITEXT(),
+        existing_nullable=False,
+    )
@@ -0,0 +1,57 @@
+"""pg_trgm GIN indexes for substring search on note titles and saved messages
+
+Revision ID: 034
+Revises: 033
+Create Date: 2026-10-15
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migration_helpers import drop_invalid_index
+
+
+revision: str = "034"
+down_revision: Union[str, None] = "033"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        drop_invalid_index("ix_notes_title_trgm")
+        op.create_index(
+            "ix_notes_title_trgm",
+            "notes",
+            ["title"],
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+            postgresql_where=sa.text("deleted_at IS NULL"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        # ILIKE '%q%' в /saved-messages/search
+        drop_invalid_index("ix_saved_messages_content_trgm")
+        op.create_index(
+            "ix_saved_messages_content_trgm",
+            "saved_messages",
+            ["content"],
+            postgresql_using="gin",
+            postgresql_ops={"content": "gin_trgm_ops"},
+            postgresql_where=sa.text("deleted_at IS NULL"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_saved_messages_content_trgm",
+            table_name="saved_messages",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index("ix_notes_title_trgm", table_name="notes", postgresql_concurrently=True, if_exists=True)
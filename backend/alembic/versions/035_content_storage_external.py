@@ -0,0 +1,33 @@
+"""Store large text columns uncompressed out-of-line (STORAGE EXTERNAL)
+
+Revision ID: 035
+Revises: 034
+Create Date: 2026-10-15
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "035"
+down_revision: Union[str, None] = "034"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+CONTENT_COLUMNS = (
+    ("notes", "content"),
+    ("chat_messages", "content"),
+    ("note_versions", "content_delta"),
+)
+
+
+def upgrade() -> None:
+    # Влияет только на новые записи; существующие TOAST-данные не переписываются
+    for table, column in CONTENT_COLUMNS:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET STORAGE EXTERNAL")
+
+
+def downgrade() -> None:
+    for table, column in CONTENT_COLUMNS:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET STORAGE EXTENDED")
@@ -0,0 +1,64 @@
+"""Move task subtasks from notes.subtasks JSONB into a subtasks table
+
+Revision ID: 036
+Revises: 035
+Create Date: 2026-10-15
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "036"
+down_revision: Union[str, None] = "035"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "subtasks",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("note_id", sa.BigInteger(), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("text", sa.Text(), nullable=False, server_default=""),
+        sa.Column("done", sa.Boolean(), nullable=False, server_default="false"),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["note_id"], ["notes.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_subtasks_note_id", "subtasks", ["note_id"])
+
+    op.execute(
+        """
+        INSERT INTO subtasks (note_id, position, text, done, completed_at)
+        SELECT n.id,
+               e.ord - 1,
+               coalesce(e.item->>'text', ''),
+               coalesce(e.item->'done' = 'true'::jsonb, false),
+               CASE WHEN e.item->'done' = 'true'::jsonb THEN n.updated_at END
+        FROM notes n
+        CROSS JOIN LATERAL jsonb_array_elements(n.subtasks) WITH ORDINALITY AS e(item, ord)
+        WHERE jsonb_typeof(n.subtasks) = 'array'
+        """
+    )
+    # notes.subtasks больше не пишется приложением; колонка удаляется отдельной ревизией
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        UPDATE notes n
+        SET subtasks = s.items
+        FROM (
+            SELECT note_id,
+                   jsonb_agg(jsonb_build_object('text', text, 'done', done) ORDER BY position) AS items
+            FROM subtasks
+            GROUP BY note_id
+        ) s
+        WHERE s.note_id = n.id
+        """
+    )
+    op.drop_index("ix_subtasks_note_id", table_name="subtasks")
+    op.drop_table("subtasks")
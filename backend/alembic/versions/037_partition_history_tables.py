@@ -0,0 +1,119 @@
+"""Hash-partition chat_messages by session_id and note_versions by note_id
+
+Revision ID: 037
+Revises: 036
+Create Date: 2026-10-15
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "037"
+down_revision: Union[str, None] = "036"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PARTITIONS = 8
+
+TABLES = {
+    "chat_messages": {
+        "key": "session_id",
+        "columns": (
+            "session_id integer NOT NULL REFERENCES chat_sessions(id) ON DELETE CASCADE, "
+            "role varchar(32) NOT NULL, "
+            "content text NOT NULL DEFAULT '', "
+            "tool_calls jsonb, "
+            "created_at timestamp NOT NULL DEFAULT now()"
+        ),
+        "column_names": "id, session_id, role, content, tool_calls, created_at",
+        "storage": "content",
+        "indexes": {
+            "ix_chat_messages_session_id_id": "(session_id, id) INCLUDE (role, created_at)",
+        },
+        "plain_indexes": {},
+    },
+    "note_versions": {
+        "key": "note_id",
+        "columns": (
+            "note_id bigint NOT NULL REFERENCES notes(id) ON DELETE CASCADE, "
+            "version integer NOT NULL, "
+            "content_delta text, "
+            "created_at timestamptz"
+        ),
+        "column_names": "id, note_id, version, content_delta, created_at",
+        "storage": "content_delta",
+        "indexes": {
+            "ix_note_versions_note_version": "UNIQUE (note_id, version)",
+        },
+        # В партиционированной таблице покрывается уникальным (note_id, version)
+        "plain_indexes": {"ix_note_versions_note_id": "(note_id)"},
+    },
+}
+
+
+def _create_index(table: str, name: str, definition: str) -> None:
+    if definition.startswith("UNIQUE "):
+        op.execute(f"CREATE UNIQUE INDEX {name} ON {table} {definition[len('UNIQUE '):]}")
+    else:
+        op.execute(f"CREATE INDEX {name} ON {table} {definition}")
+
+
+def _rebuild(table: str, partitioned: bool) -> None:
+    """Recreate table (partitioned or plain), copy rows, keep the id sequence."""
+    spec = TABLES[table]
+    old = f"{table}_old"
+    seq = op.get_bind().execute(
+        sa.text("SELECT pg_get_serial_sequence(:t, 'id')"), {"t": table}
+    ).scalar_one()
+
+    op.execute(f"ALTER TABLE {table} RENAME TO {old}")
+    op.execute(f"ALTER TABLE {old} RENAME CONSTRAINT {table}_pkey TO {old}_pkey")
+    for name in (*spec["indexes"], *spec["plain_indexes"]):
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+
+    key = spec["key"]
+    pk = f"id, {key}" if partitioned else "id"
+    partition_clause = f" PARTITION BY HASH ({key})" if partitioned else ""
+    op.execute(
+        f"CREATE TABLE {table} (id bigint NOT NULL DEFAULT nextval('{seq}'), {spec['columns']}, "
+        f"CONSTRAINT {table}_pkey PRIMARY KEY ({pk})){partition_clause}"
+    )
+    if partitioned:
+        for i in range(PARTITIONS):
+            op.execute(
+                f"CREATE TABLE {table}_p{i} PARTITION OF {table} "
+                f"FOR VALUES WITH (MODULUS {PARTITIONS}, REMAINDER {i})"
+            )
+    op.execute(f"ALTER TABLE {table} ALTER COLUMN {spec['storage']} SET STORAGE EXTERNAL")
+
+    cols = spec["column_names"]
+    op.execute(f"INSERT INTO {table} ({cols}) SELECT {cols} FROM {old}")
+    op.execute(f"ALTER SEQUENCE {seq} OWNED BY {table}.id")
+    op.execute(f"DROP TABLE {old}")
+
+    indexes = spec["indexes"] if partitioned else {**spec["indexes"], **spec["plain_indexes"]}
+    for name, definition in indexes.items():
+        _create_index(table, name, definition)
+
+
+def _touch_session_trigger() -> None:
+    # Триггер из 032 удаляется вместе со старой таблицей
+    op.execute(
+        "CREATE TRIGGER trg_chat_messages_touch_session AFTER INSERT ON chat_messages "
+        "FOR EACH ROW EXECUTE FUNCTION touch_chat_session()"
+    )
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        _rebuild(table, partitioned=True)
+    _touch_session_trigger()
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        _rebuild(table, partitioned=False)
+    _touch_session_trigger()
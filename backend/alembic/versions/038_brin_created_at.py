@@ -0,0 +1,53 @@
+"""BRIN indexes on created_at of append-only tables
+
+Revision ID: 038
+Revises: 037
+Create Date: 2026-10-15
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from migration_helpers import drop_invalid_index
+
+
+revision: str = "038"
+down_revision: Union[str, None] = "037"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BRIN_INDEXES = (
+    ("ix_note_versions_created_brin", "note_versions"),
+    ("ix_saved_messages_created_brin", "saved_messages"),
+)
+
+# CREATE INDEX CONCURRENTLY не поддерживается для партиционированных таблиц
+PARTITIONED_TABLES = {"note_versions"}
+
+
+def upgrade() -> None:
+    for name, table in BRIN_INDEXES:
+        kwargs = {"postgresql_using": "brin", "postgresql_with": {"pages_per_range": 32}}
+        if table in PARTITIONED_TABLES:
+            op.create_index(name, table, ["created_at"], **kwargs)
+            continue
+        with op.get_context().autocommit_block():
+            drop_invalid_index(name)
+            op.create_index(
+                name,
+                table,
+                ["created_at"],
+                postgresql_concurrently=True,
+                if_not_exists=True,
+                **kwargs,
+            )
+
+
+def downgrade() -> None:
+    for name, table in BRIN_INDEXES:
+        if table in PARTITIONED_TABLES:
+            op.drop_index(name, table_name=table)
+            continue
+        with op.get_context().autocommit_block():
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,60 @@
+"""timestamptz with DEFAULT now() for created_at/updated_at of events, chat and note history tables
+
+Revision ID: 039
+Revises: 038
+Create Date: 2026-10-15
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "039"
+down_revision: Union[str, None] = "038"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, column, was timestamptz already, was nullable): filled by the database, NOT NULL
+DEFAULTED_COLUMNS = (
+    ("events", "created_at", False, True),
+    ("chat_sessions", "created_at", False, False),
+    ("chat_sessions", "updated_at", False, False),
+    ("chat_messages", "created_at", False, False),
+    ("note_versions", "created_at", True, True),
+)
+
+
+def upgrade() -> None:
+    # Stored values are naive UTC (datetime.utcnow), so interpret them as UTC.
+    for table, column, was_tz, was_nullable in DEFAULTED_COLUMNS:
+        if was_nullable:
+            op.execute(f"UPDATE {table} SET {column} = now() WHERE {column} IS NULL")
+        kwargs = {}
+        if not was_tz:
+            kwargs = {"type_": sa.DateTime(timezone=True), "postgresql_using": f"{column} AT TIME ZONE 'UTC'"}
+        op.alter_column(
+            table,
+            column,
+            existing_type=sa.DateTime(timezone=was_tz),
+            server_default=sa.text("now()"),
+            nullable=False,
+            **kwargs,
+        )
+
+
+def downgrade() -> None:
+    for table, column, was_tz, was_nullable in reversed(DEFAULTED_COLUMNS):
+        kwargs = {}
+        if not was_tz:
+            kwargs = {"type_": sa.DateTime(), "postgresql_using": f"{column} AT TIME ZONE 'UTC'"}
+        op.alter_column(
+            table,
+            column,
+            existing_type=sa.DateTime(timezone=True),
+            # chat tables had DEFAULT now() from the start
+            server_default=None if was_nullable else sa.text("now()"),
+            nullable=was_nullable,
+            **kwargs,
+        )
@@ -1,31 +1,110 @@
 """Base executor: _execute_tool, _try_parse_text_tool_call, build_system_prompt."""
 
 import asyncio
+import contextlib
+import functools
 import json
 import logging
+import re
 from abc import ABC, abstractmethod
+from contextvars import ContextVar
+from datetime import datetime, timezone
 from json import JSONDecodeError
+from collections.abc import AsyncIterator, Awaitable, Callable
 from typing import Any
 
 from pydantic import ValidationError
+from sqlalchemy import text
 
 from app.agent.tools.tool_def import ToolDefinition
+from app.config import settings
+from app.database import async_session_maker
+from app.services.agent import build_context
+from app.services.agent_settings_service import get_agent_settings
 
 logger = logging.getLogger(__name__)
 
+_TOOL_TAGS = (
+    ("<tool_call>", "</tool_call>"),
+    ("<function-call>", "</function-call>"),
+    ("<tool_response>", "</tool_response>"),
+)
+_CODEFENCE_RE = re.compile(r"^```[^\n]*\n(.*?)\n?```$", re.S)
+
+
+# Tools that only touch their own rows: executors run them on a separate session, concurrently
+# with the order-dependent tools of the turn (create_* -> suggest_tags -> add_tags_to_note)
+_ISOLATED_TOOLS = frozenset({"update_user_profile"})
+
+
+# "now" pinned for one dispatched agent request (set in AgentDispatcher.process)
+_REQUEST_NOW: ContextVar[datetime | None] = ContextVar("request_now", default=None)
+
+
+# asyncio.timeout() bounding context load and the LLM call of a dispatched turn (set in AgentDispatcher.process)
+_TURN_DEADLINE: ContextVar[asyncio.Timeout | None] = ContextVar("turn_deadline", default=None)
+
+
+def request_now() -> datetime:
+    """UTC now for the current agent request; falls back to the live clock outside one."""
+    return _REQUEST_NOW.get() or datetime.now(timezone.utc)
+
+
+_TODAY_CACHE: tuple[int, str] = (0, "")
+
+
+def today_str() -> str:
+    """request_now() as "YYYY-MM-DD, Weekday" for prompts; strftime runs once per day."""
+    global _TODAY_CACHE
+    now = request_now()
+    day = now.toordinal()
+    if _TODAY_CACHE[0] != day:
+        _TODAY_CACHE = (day, now.strftime("%Y-%m-%d, %A"))
+    return _TODAY_CACHE[1]
+
+
+async def _noop_emit(phase: str, **data: Any) -> None:
+    return None
+
+
+def make_emit(on_event: Any) -> Callable[..., Awaitable[None]]:
+    """emit(phase, **data) -> on_event(phase, data); a shared no-op when nobody listens."""
+    if on_event is None:
+        return _noop_emit
+
+    def emit(phase: str, **data: Any) -> Awaitable[None]:
+        return on_event(phase, data)
+
+    return emit
+
+
+def _first_non_ws(s: str) -> str:
+    """First non-whitespace character of s ("" if none), without copying s like strip() does."""
+    i, n = 0, len(s)
+    while i < n and s[i] <= " ":
+        i += 1
+    return s[i] if i < n else ""
+
+
+@functools.lru_cache(maxsize=16)
+def _analyze_template(template: str) -> tuple[bool, bool]:
+    """(has {tools} placeholder, already mentions the current date) — templates are static."""
+    return "{tools}" in template, "текущая дата" in template.lower()
+
 
 def build_system_prompt(template: str, tools_section: str, current_time: str) -> str:
     """Build system prompt. Tools passed via API; tools_section for prompt if template has {tools}."""
-    base = template.replace("{current_time}", current_time).replace("{tools}", tools_section)
-    if "{tools}" not in template and tools_section:
+    has_tools, has_date = _analyze_template(template)
+    base = template.replace("{current_time}", current_time)
+    if has_tools:
+        base = base.replace("{tools}", tools_section)
+    elif tools_section:
         base = f"{base}\n\n{tools_section}"
-    year = current_time.split("-")[0] if "-" in current_time else current_time[:4]
-    reminder = (
-        f"Текущая дата: {current_time} (год {year}). "
-        "Отвечай на том же языке, на котором пишет пользователь."
-    )
-    if "текущая дата" not in base.lower():
-        base = f"{base}\n\n{reminder}"
+    if not has_date:
+        base = (
+            f"{base}\n\nТекущая дата: {current_time} (год {current_time[:4]}). "
+            "Отвечай на том же языке, на котором пишет пользователь."
+        )
     return base
 
 
@@ -45,27 +124,114 @@ class BaseChatExecutor(ABC):
 
     def __init__(self, tools: dict[str, ToolDefinition], max_tool_output_chars: int = 8000):
         self._tools = tools
+        self._tool_names: frozenset[str] = frozenset(tools)
+        self._tools_get = tools.get
         self._max_tool_output_chars = max_tool_output_chars
 
+    async def _load_context(
+        self,
+        db: Any,
+        user_id: int,
+        agent_params: dict[str, Any] | None,
+        **context_kwargs: Any,
+    ) -> tuple[str, str, dict[str, Any]]:
+        """(context, profile_block, agent_params). Missing agent settings are read concurrently
+        with build_context on a separate session (AsyncSession is not concurrency-safe)."""
+        if agent_params is not None:
+            context, profile_block = await build_context(db, user_id, **context_kwargs)
+            return context, profile_block, agent_params
+
+        async def _settings() -> dict[str, Any]:
+            async with async_session_maker() as settings_db:
+                return await get_agent_settings(settings_db, user_id, "notes")
+
+        (context, profile_block), agent_params = await asyncio.gather(
+            build_context(db, user_id, **context_kwargs), _settings()
+        )
+        return context, profile_block, agent_params
+
+    @contextlib.asynccontextmanager
+    async def _side_tasks(self) -> AsyncIterator[list[asyncio.Task]]:
+        """Collects the turn's _start_isolated_tool tasks; ones still pending when the turn raises or is
+        cancelled are cancelled and awaited rather than left running without an owner."""
+        tasks: list[asyncio.Task] = []
+        try:
+            yield tasks
+        finally:
+            pending = [t for t in tasks if not t.done()]
+            for t in pending:
+                t.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    def _start_isolated_tool(self, name: str, args_str: str, args: dict[str, Any], user_id: int) -> asyncio.Task:
+        """Run an _ISOLATED_TOOLS call in the background on its own session; await before finishing the turn."""
+
+        async def _run() -> str:
+            async with async_session_maker() as tool_db:
+                result = await self._execute_tool(
+                    tool_name=name,
+                    raw_args=args_str,
+                    parsed_args=args,
+                    tool_call_id=f"tc_{name}",
+                    extra_context={"user_id": user_id, "db": tool_db},
+                )
+                try:
+                    await self._commit(tool_db)
+                except Exception as e:
+                    logger.error(
+                        "isolated tool commit failed",
+                        extra={"executor": self._executor_name, "tool": name, "error": str(e)},
+                    )
+                return result
+
+        return asyncio.create_task(_run())
+
+    @staticmethod
+    async def _commit(db: Any) -> None:
+        """Commit the turn. With AGENT_ASYNC_COMMIT the commit doesn't wait for the WAL flush:
+        a server crash right after it may lose this turn's writes (the user can resubmit)."""
+        if settings.agent_async_commit:
+            await db.execute(text("SET LOCAL synchronous_commit = off"))
+        await db.commit()
+
+    @staticmethod
+    async def _leave_deadline() -> None:
+        """Take the rest of the turn out of the dispatcher's deadline. Called before the first tool runs:
+        tools write workspace files and commit profile facts that a rollback can't undo, so a timeout
+        after that point would report "nothing done" for a half-applied turn."""
+        deadline = _TURN_DEADLINE.get()
+        if deadline is not None:
+            if deadline.expired():
+                # Cancellation is already pending: let it land before anything is written
+                await asyncio.sleep(0)
+            deadline.reschedule(None)
+
+    async def _commit_turn(self, db: Any) -> None:
+        """Final commit of a turn, outside the turn deadline (see _leave_deadline)."""
+        await self._leave_deadline()
+        await self._commit(db)
+
     def _try_parse_text_tool_call(self, content: str) -> dict | None:
         """Detect tool call as plain JSON in text (model bypassed function_call)."""
-        if not content or not content.strip():
+        # Prose replies: no JSON object or no "name" key — skip the scans below
+        if not content or "{" not in content or "name" not in content:
+            return None
+        # Without wrapper tags the call must be a bare JSON object or a code fence
+        if "<" not in content and _first_non_ws(content) not in ("{", "`"):
             return None
         stripped = content.strip()
-        for tag in ("tool_call", "function-call", "tool_response"):
-            open_tag = f"<{tag}>"
-            close_tag = f"</{tag}>"
-            if open_tag in stripped and close_tag in stripped:
-                start = stripped.find(open_tag) + len(open_tag)
+        if "<" in stripped:
+            found = [(pos, o, c) for o, c in _TOOL_TAGS if (pos := stripped.find(o)) != -1]
+            if found:
+                pos, open_tag, close_tag = min(found)
+                start = pos + len(open_tag)
                 end = stripped.find(close_tag, start)
                 if end != -1:
                     stripped = stripped[start:end].strip()
-                break
         if stripped.startswith("```"):
-            lines = stripped.split("\n")
-            if lines and lines[0].startswith("```"):
-                end = len(lines) - 1 if lines[-1].strip() == "```" else len(lines)
-                stripped = "\n".join(lines[1:end])
+            m = _CODEFENCE_RE.match(stripped)
+            stripped = m.group(1) if m else stripped.partition("\n")[2]
         if not (stripped.startswith("{") and stripped.endswith("}")):
             return None
         try:
@@ -77,7 +243,7 @@ class BaseChatExecutor(ABC):
         name = obj.get("name")
         if not isinstance(name, str) or not name:
             return None
-        if self._tools.get(name) is None:
+        if name not in self._tool_names:
             return None
         arguments = obj.get("arguments")
         if isinstance(arguments, dict):
@@ -94,19 +260,26 @@ class BaseChatExecutor(ABC):
         raw_args: str,
         tool_call_id: str,
         extra_context: dict[str, Any] | None = None,
+        parsed_args: dict[str, Any] | None = None,
     ) -> str:
-        """Execute tool with validation and timeout. Returns result string."""
-        tool_def = self._tools.get(tool_name)
+        """Execute tool with validation and timeout. Returns result string.
+
+        parsed_args: raw_args already decoded by the caller; skips the second json.loads.
+        """
+        tool_def = self._tools_get(tool_name)
         if tool_def is None:
             return f"Error: tool '{tool_name}' not found"
 
-        try:
-            args_dict = json.loads(raw_args) if raw_args.strip() else {}
-        except JSONDecodeError as exc:
-            return f"Error: invalid JSON arguments for tool '{tool_name}': {exc}"
+        if parsed_args is not None:
+            args_dict = parsed_args
+        else:
+            try:
+                args_dict = json.loads(raw_args) if raw_args.strip() else {}
+            except JSONDecodeError as exc:
+                return f"Error: invalid JSON arguments for tool '{tool_name}': {exc}"
 
         try:
-            validated = tool_def.validate_args(args_dict)
+            kwargs = tool_def.validate_kwargs(args_dict)
         except ValidationError as exc:
             return f"Error: tool '{tool_name}' validation error: {exc}"
 
@@ -114,16 +287,13 @@ class BaseChatExecutor(ABC):
         if timeout <= 0:
             raise ValueError(f"Tool '{tool_name}' has invalid timeout_seconds={timeout}")
 
-        kwargs = dict(validated.model_dump())
         if extra_context:
             kwargs.update(extra_context)
 
         try:
-            result = await asyncio.wait_for(
-                tool_def.instance.call(**kwargs),
-                timeout=timeout,
-            )
-        except asyncio.TimeoutError:
+            async with asyncio.timeout(timeout):
+                result = await tool_def.instance.call(**kwargs)
+        except TimeoutError:
             return f"Error: tool '{tool_name}' timed out after {timeout}s"
         except TypeError as exc:
             return f"Error: tool '{tool_name}' argument error: {exc}"
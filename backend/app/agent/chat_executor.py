@@ -1,5 +1,6 @@
 """Chat executor: streaming turn with search_notes tool."""
 
+import asyncio
 import json
 import logging
 from collections.abc import AsyncGenerator
@@ -13,7 +14,10 @@ from app.agent.tools.tool_def import (
     SEARCH_NOTES_TOOL_DEF,
     ReadNotesParams,
     SearchNotesParams,
+    _normalize_queries,
+    json_schema,
 )
+from app.database import async_session_maker
 from app.services.llm import chat_completion_stream
 
 logger = logging.getLogger(__name__)
@@ -31,12 +35,20 @@ TOOLS = {
     "get_notes_tree": GET_NOTES_TREE_TOOL_DEF,
     "read_notes": READ_NOTES_TOOL_DEF,
 }
+_TOOL_NAMES = frozenset(TOOLS)
 
+# Max tool calls from one LLM response running at once (each holds a DB connection)
+_TOOL_CONCURRENCY = 4
 
-def _get_tools_for_prompt() -> str:
-    search_props = SearchNotesParams.model_json_schema().get("properties", {})
+# content_delta coalescing: flush after this many bytes or seconds, whichever comes first
+_STREAM_BUF_BYTES = 8192
+_STREAM_FLUSH_SEC = 0.025
+
+
+def _compute_tools_for_prompt() -> str:
+    search_props = json_schema(SearchNotesParams).get("properties", {})
     search_params = ", ".join(search_props.keys())
-    read_props = ReadNotesParams.model_json_schema().get("properties", {})
+    read_props = json_schema(ReadNotesParams).get("properties", {})
     read_params = ", ".join(read_props.keys())
     return (
         f"search_notes - {SEARCH_NOTES_TOOL_DEF.description} ({search_params})\n"
@@ -45,6 +57,14 @@ def _get_tools_for_prompt() -> str:
     )
 
 
+_TOOLS_FOR_PROMPT = _compute_tools_for_prompt()
+_OPENAI_TOOLS = tuple(t.to_openai_function() for t in TOOLS.values())
+
+
+def _get_tools_for_prompt() -> str:
+    return _TOOLS_FOR_PROMPT
+
+
 async def _stream_turn(
     executor: "ChatExecutor",
     messages: list[dict[str, Any]],
@@ -55,25 +75,25 @@ async def _stream_turn(
     max_iterations: int = 10,
 ) -> AsyncGenerator[dict[str, Any], None]:
     """Stream one turn. Yields content_delta, tool_call, tool_result, done."""
-    full_content = ""
+    full_parts: list[str] = []
     tool_calls_saved: list[dict[str, Any]] | None = None
     iteration = 0
 
     while iteration < max_iterations:
         iteration += 1
-        logger.info("chat: LLM iteration", extra={"iteration": iteration})
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("chat: LLM iteration", extra={"iteration": iteration})
         tool_calls_by_id: dict[str, dict[str, Any]] = {}
-        turn_content = ""
+        turn_parts: list[str] = []
 
-        openai_tools = [
-            SEARCH_NOTES_TOOL_DEF.to_openai_function(),
-            GET_NOTES_TREE_TOOL_DEF.to_openai_function(),
-            READ_NOTES_TOOL_DEF.to_openai_function(),
-        ]
+        loop = asyncio.get_running_loop()
+        delta_buf: list[str] = []
+        buf_bytes = 0
+        last_flush = loop.time()
 
-        async for chunk in chat_completion_stream(
+        async for ev in chat_completion_stream(
             messages,
-            tools=openai_tools,
+            tools=_OPENAI_TOOLS,
             base_url=agent_params.get("base_url"),
             model=agent_params.get("model"),
             api_key=agent_params.get("api_key") or None,
@@ -82,27 +102,42 @@ async def _stream_turn(
             top_p=agent_params["top_p"],
             max_tokens=agent_params["max_tokens"],
         ):
-            if chunk.get("type") == "content_delta":
-                delta = chunk.get("delta", "")
-                turn_content += delta
-                full_content += delta
-                yield {"type": "content_delta", "delta": delta}
-            elif chunk.get("type") == "tool_call":
-                idx = chunk.get("index", 0)
+            if ev[0] == "content":
+                delta = ev[1]
+                turn_parts.append(delta)
+                full_parts.append(delta)
+                delta_buf.append(delta)
+                buf_bytes += len(delta)
+                now = loop.time()
+                if buf_bytes >= _STREAM_BUF_BYTES or now - last_flush >= _STREAM_FLUSH_SEC:
+                    yield {"type": "content_delta", "delta": "".join(delta_buf)}
+                    delta_buf.clear()
+                    buf_bytes = 0
+                    last_flush = now
+            elif ev[0] == "tool":
+                if delta_buf:
+                    yield {"type": "content_delta", "delta": "".join(delta_buf)}
+                    delta_buf.clear()
+                    buf_bytes = 0
+                    last_flush = loop.time()
+                _, idx, tc_id, name, args_chunk = ev
                 key = f"idx_{idx}"
-                tc_id = chunk.get("id", "")
-                name = chunk.get("name", "")
-                args_chunk = chunk.get("arguments", "")
                 if key not in tool_calls_by_id:
-                    tool_calls_by_id[key] = {"id": tc_id or key, "name": name, "arguments": ""}
-                tool_calls_by_id[key]["arguments"] += args_chunk
+                    tool_calls_by_id[key] = {"id": tc_id or key, "name": name, "arguments": []}
+                tool_calls_by_id[key]["arguments"].append(args_chunk)
                 if name:
                     tool_calls_by_id[key]["name"] = name
                 if tc_id and tc_id.startswith("call_"):
                     tool_calls_by_id[key]["id"] = tc_id
 
+        if delta_buf:
+            yield {"type": "content_delta", "delta": "".join(delta_buf)}
+        turn_content = "".join(turn_parts)
+        for tc in tool_calls_by_id.values():
+            tc["arguments"] = "".join(tc["arguments"])
+
         # Fallback: model sometimes outputs tool call as JSON in text
-        if not tool_calls_by_id and turn_content.strip():
+        if not tool_calls_by_id and "{" in turn_content and "name" in turn_content:
             parsed = executor._try_parse_text_tool_call(turn_content)
             if parsed:
                 tool_calls_by_id["fallback"] = {
@@ -115,12 +150,13 @@ async def _stream_turn(
         executed_any = False
         assistant_tool_calls = []
         tool_results: list[dict[str, Any]] = []
+        calls: list[tuple[str, str, str, dict[str, Any], dict[str, Any]]] = []
 
         for tc_key, tc in tool_calls_by_id.items():
             tc_id = tc.get("id", tc_key)
             name = tc.get("name")
             args_str = tc.get("arguments", "") or "{}"
-            if name not in TOOLS:
+            if name not in _TOOL_NAMES:
                 continue
 
             try:
@@ -129,7 +165,8 @@ async def _stream_turn(
                 logger.warning("chat: tool args JSON parse failed", extra={"args_preview": str(args_str)[:200], "error": str(e)})
                 continue
 
-            logger.info("chat: tool_call", extra={"name": name, "tool_call_id": tc_id})
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("chat: tool_call", extra={"name": name, "tool_call_id": tc_id})
             yield {"type": "tool_call", "id": tc_id, "name": name, "arguments": args}
 
             extra: dict[str, Any] = {"user_id": user_id, "db": db}
@@ -140,22 +177,49 @@ async def _stream_turn(
                 semantic = _normalize_queries(raw_semantic)
                 if not (exact or semantic):
                     extra["fallback_query"] = user_content
+            calls.append((tc_id, name, args_str, args, extra))
 
-            result = await executor._execute_tool(
-                tool_name=name,
-                raw_args=args_str,
-                tool_call_id=tc_id,
-                extra_context=extra,
+        if len(calls) > 1:
+            semaphore = asyncio.Semaphore(_TOOL_CONCURRENCY)
+            outcomes = await asyncio.gather(
+                *(_run_tool_isolated(executor, semaphore, *call) for call in calls),
+                return_exceptions=True,
             )
+        elif calls:
+            tc_id, name, args_str, args, extra = calls[0]
+            outcomes = [
+                await executor._execute_tool(
+                    tool_name=name,
+                    raw_args=args_str,
+                    tool_call_id=tc_id,
+                    extra_context=extra,
+                    parsed_args=args,
+                )
+            ]
+        else:
+            outcomes = []
+
+        for (tc_id, name, args_str, _, _), result in zip(calls, outcomes):
+            if isinstance(result, BaseException):
+                logger.error(
+                    "chat: tool failed",
+                    extra={"name": name, "tool_call_id": tc_id, "error": str(result)},
+                )
+                result = f"Error executing {name}: {type(result).__name__}: {result}"
 
             if name == "search_notes":
-                try:
-                    results = json.loads(result) if isinstance(result, str) and result.strip().startswith("[") else []
-                except json.JSONDecodeError:
+                # Trimmed output is never valid JSON — don't spend a parse on it
+                if not isinstance(result, str) or "[TRIMMED" in result:
                     results = []
+                else:
+                    try:
+                        results = json.loads(result)
+                    except json.JSONDecodeError:
+                        results = []
                 if not isinstance(results, list):
                     results = []
-                logger.info("chat: tool_result", extra={"results_count": len(results), "note_ids": [r.get("id") for r in results]})
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("chat: tool_result", extra={"results_count": len(results), "note_ids": [r.get("id") for r in results]})
                 yield {"type": "tool_result", "id": tc_id, "results": results}
             else:
                 yield {"type": "tool_result", "id": tc_id, "content": result}
@@ -169,34 +233,37 @@ async def _stream_turn(
             tool_results.append({"tool_call_id": tc_id, "content": result})
 
         if executed_any:
-            logger.info("chat: tool executed, continuing loop")
-            messages.append({"role": "assistant", "content": turn_content, "tool_calls": assistant_tool_calls})
-            for tr in tool_results:
-                messages.append({"role": "tool", "tool_call_id": tr["tool_call_id"], "content": tr["content"]})
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("chat: tool executed, continuing loop")
+            messages.extend([
+                {"role": "assistant", "content": turn_content, "tool_calls": assistant_tool_calls},
+                *({"role": "tool", "tool_call_id": tr["tool_call_id"], "content": tr["content"]} for tr in tool_results),
+            ])
         else:
             tool_calls_saved = [{"name": t.get("name"), "arguments": t.get("arguments", "")} for t in tool_calls_by_id.values()]
             break
 
-    yield {"type": "_internal_final", "content": full_content, "tool_calls_saved": tool_calls_saved}
-
-
-def _normalize_queries(raw: Any) -> list[str]:
-    """Normalize model output to flat list of query strings."""
-    import re
-
-    result: list[str] = []
-    if raw is None:
-        return result
-    items = raw if isinstance(raw, list) else [raw]
-    for x in items:
-        s = str(x).strip() if x is not None else ""
-        if not s:
-            continue
-        for p in re.split(r"[,;\n]+", s):
-            q = p.strip()
-            if q:
-                result.append(q)
-    return result
+    yield {"type": "_internal_final", "content": "".join(full_parts), "tool_calls_saved": tool_calls_saved}
+
+
+async def _run_tool_isolated(
+    executor: "ChatExecutor",
+    semaphore: asyncio.Semaphore,
+    tc_id: str,
+    name: str,
+    args_str: str,
+    args: dict[str, Any],
+    extra: dict[str, Any],
+) -> str:
+    """Run one of several parallel tool calls on its own DB session (AsyncSession is not concurrency-safe)."""
+    async with semaphore, async_session_maker() as tool_db:
+        return await executor._execute_tool(
+            tool_name=name,
+            raw_args=args_str,
+            tool_call_id=tc_id,
+            extra_context={**extra, "db": tool_db},
+            parsed_args=args,
+        )
 
 
 class ChatExecutor(BaseChatExecutor):
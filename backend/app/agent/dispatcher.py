@@ -1,16 +1,24 @@
 """Agent dispatcher: routes requests to NotesExecutor, TaskExecutor, or EventExecutor by intent."""
 
+import asyncio
 import logging
+from datetime import datetime, timezone
 from typing import Any
 
+from app.agent.base_executor import _REQUEST_NOW, _TURN_DEADLINE
 from app.agent.event_executor import EventExecutor
 from app.agent.intent_classifier import IntentCategory
 from app.agent.notes_executor import NotesExecutor
 from app.agent.task_executor import TaskExecutor
+from app.config import settings
+from app.services import search
 
 logger = logging.getLogger(__name__)
 
 
+TURN_TIMEOUT_REASON = "превышено время ожидания ответа модели"
+
+
 class UnknownIntentError(ValueError):
     """Raised when intent is UNKNOWN."""
 
@@ -29,6 +37,11 @@ class AgentDispatcher:
         self.notes = notes_executor or NotesExecutor()
         self.task = task_executor or TaskExecutor()
         self.event = event_executor or EventExecutor()
+        self._routes = {
+            IntentCategory.NOTE: self.notes,
+            IntentCategory.TASK: self.task,
+            IntentCategory.EVENT: self.event,
+        }
 
     async def process(
         self,
@@ -43,46 +56,51 @@ class AgentDispatcher:
     ) -> tuple[list[int], list[int], str | None]:
         """Dispatch to executor and return (affected_ids, created_ids, skipped_reason)."""
         if intent == IntentCategory.UNKNOWN:
+            executor = None
+        elif note_id is not None:
+            # When user has a note/task selected, always use NotesExecutor — it supports append/patch.
+            # TaskExecutor only has create_task and would create a duplicate instead of editing.
+            executor = self.notes
+        else:
+            executor = self._routes.get(intent)
+        if executor is None:
             raise UnknownIntentError("Не понял запрос. Попробуйте переформулировать.")
 
-        # When user has a note/task selected, always use NotesExecutor — it supports append/patch.
-        # TaskExecutor only has create_task and would create a duplicate instead of editing.
-        if note_id is not None:
-            return await self.notes.execute_turn(
-                db=db,
-                user_id=user_id,
-                user_input=user_input,
-                note_id=note_id,
-                agent_params=agent_params,
-                on_event=on_event,
-            )
-
-        if intent == IntentCategory.NOTE:
-            return await self.notes.execute_turn(
-                db=db,
-                user_id=user_id,
-                user_input=user_input,
-                note_id=note_id,
-                agent_params=agent_params,
-                on_event=on_event,
+        token = _REQUEST_NOW.set(datetime.now(timezone.utc))
+        deadline = asyncio.timeout(settings.agent_turn_timeout_sec or None)
+        try:
+            # Tools only schedule search index writes; one write per note after the turn committed
+            with search.deferred_indexing() as pending_index:
+                # Bounds context load and the LLM call; executors leave it before the first tool writes anything
+                async with deadline:
+                    deadline_token = _TURN_DEADLINE.set(deadline)
+                    try:
+                        result = await executor.execute_turn(
+                            db=db,
+                            user_id=user_id,
+                            user_input=user_input,
+                            note_id=note_id,
+                            agent_params=agent_params,
+                            on_event=on_event,
+                        )
+                    finally:
+                        _TURN_DEADLINE.reset(deadline_token)
+                search.flush_index(pending_index)
+                return result
+        except TimeoutError:
+            if not deadline.expired():
+                raise
+            logger.warning(
+                "dispatcher: turn timed out",
+                extra={"user_id": user_id, "intent": intent.value, "timeout": settings.agent_turn_timeout_sec},
             )
-        if intent == IntentCategory.TASK:
-            return await self.task.execute_turn(
-                db=db,
-                user_id=user_id,
-                user_input=user_input,
-                note_id=note_id,
-                agent_params=agent_params,
-                on_event=on_event,
-            )
-        if intent == IntentCategory.EVENT:
-            return await self.event.execute_turn(
-                db=db,
-                user_id=user_id,
-                user_input=user_input,
-                note_id=note_id,
-                agent_params=agent_params,
-                on_event=on_event,
-            )
-
-        raise UnknownIntentError("Не понял запрос. Попробуйте переформулировать.")
+            # No tool has run yet (see _leave_deadline); drop whatever context loading left in the session
+            await db.rollback()
+            if on_event:
+                await on_event(
+                    "done",
+                    {"affected_ids": [], "created_ids": [], "created_note_ids": [], "skipped": True, "reason": TURN_TIMEOUT_REASON},
+                )
+            return [], [], TURN_TIMEOUT_REASON
+        finally:
+            _REQUEST_NOW.reset(token)
@@ -1,15 +1,16 @@
 """Event executor: create calendar events. Tools: create_note_with_event, update_user_profile."""
 
+import asyncio
 import json
 import logging
+import re
 from typing import Any
 
-from app.agent.base_executor import BaseChatExecutor
+from app.agent.base_executor import _ISOLATED_TOOLS, BaseChatExecutor, make_emit, today_str
 from app.agent.tools.event_tool_def import CREATE_NOTE_WITH_EVENT_TOOL_DEF
 from app.agent.tools.notes_tool_def import UPDATE_USER_PROFILE_TOOL_DEF
-from app.services.agent import build_context
-from app.services.agent_settings_service import get_agent_settings
-from app.services.llm import chat_completion
+from app.config import settings
+from app.services.llm import chat_completion, extract_tool_calls
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +23,9 @@ TOOLS = {
     "create_note_with_event": CREATE_NOTE_WITH_EVENT_TOOL_DEF,
     "update_user_profile": UPDATE_USER_PROFILE_TOOL_DEF,
 }
+_OPENAI_TOOLS = tuple(t.to_openai_function() for t in TOOLS.values())
+# Tool name -> progress label; membership doubles as the "known tool" check
+_TOOL_LABELS = {name: TOOL_DISPLAY.get(name, name) for name in TOOLS}
 
 SYSTEM_PROMPT = """Ты — агент событий календаря. Пользователь просит напоминание, встречу, добавить в календарь.
 
@@ -34,6 +38,23 @@ SYSTEM_PROMPT = """Ты — агент событий календаря. Пол
 
 После create_note_with_event — ОБЯЗАТЕЛЬНО проверь: есть ли в запросе сфера/контекст (работа, встреча, проект). Если да и её нет в «Известно о пользователе» — вызови update_user_profile.
 Отвечай ТОЛЬКО вызовами create_note_with_event (и update_user_profile)."""
+_SYS_PREFIX = SYSTEM_PROMPT + "\n\nСегодня: "
+
+# Cheap pre-check before the LLM call: requests with none of these markers have no date/time.
+# Deliberately broad — a false match just falls through to the LLM.
+# Date/time pre-filter (AGENT_EVENT_DATETIME_FILTER): input without any marker skips the LLM call
+_DATETIME_RE = re.compile(
+    r"сегодня|завтра|вчера|через\s|недел|месяц|выходн|числ|"
+    r"понедельник|вторник|сред[аеуы]|четверг|пятниц|суббот|воскресень|"
+    r"утр|вечер|ноч|днём|днем|полдень|полноч|обед|ужин|завтрак|\bпол\w+ого\b|"
+    r"январ|феврал|март|апрел|\bма[йяюе]\b|июн|июл|август|сентябр|октябр|ноябр|декабр|"
+    r"\d{1,2}[:.]\d{2}|\d{1,2}\s*(?:ч\b|час|мин)|\bв\s+\d{1,2}\b|\d{1,2}[./-]\d{1,2}|\b\d{1,2}-?(?:го|е|ое)\b|"
+    r"today|tonight|tomorrow|\d\s*(?:am|pm)\b|"
+    r"monday|tuesday|wednesday|thursday|friday|saturday|sunday|weekend|next\s+(?:week|month)|"
+    r"\bin\s+(?:\d+|an?)\s+(?:hours?|minutes?|mins?|days?|weeks?)\b|\bat\s+\d{1,2}\b|noon|midnight",
+    re.IGNORECASE,
+)
+NO_DATETIME_REASON = "не указаны дата или время"
 
 
 class EventExecutor(BaseChatExecutor):
@@ -54,16 +75,18 @@ class EventExecutor(BaseChatExecutor):
         on_event: Any = None,
     ) -> tuple[list[int], list[int], str | None]:
         """Execute one turn. Returns (affected_ids, created_ids, skipped_reason)."""
-        async def emit(phase: str, **data: Any) -> None:
-            if on_event:
-                await on_event(phase, data)
+        emit = make_emit(on_event)
+
+        if settings.agent_event_datetime_filter and not _DATETIME_RE.search(user_input):
+            await emit("done", affected_ids=[], created_ids=[], created_note_ids=[], skipped=True, reason=NO_DATETIME_REASON)
+            return [], [], NO_DATETIME_REASON
 
         await emit("building_context", message="Загрузка контекста…")
-        context, profile_block = await build_context(db, user_id, note_id=note_id)
+        context, profile_block, agent_params = await self._load_context(
+            db, user_id, agent_params, note_id=note_id
+        )
 
-        from datetime import datetime, timezone
-        today_str = datetime.now(timezone.utc).strftime("%Y-%m-%d, %A")
-        system_content = SYSTEM_PROMPT + f"\n\nСегодня: {today_str}" + profile_block
+        system_content = f"{_SYS_PREFIX}{today_str()}{profile_block}"
 
         messages = [
             {"role": "system", "content": system_content},
@@ -73,16 +96,10 @@ class EventExecutor(BaseChatExecutor):
         affected_ids: list[int] = []
         created_ids: list[int] = []
 
-        if agent_params is None:
-            agent_params = await get_agent_settings(db, user_id, "notes")
-
-        tool_defs = [CREATE_NOTE_WITH_EVENT_TOOL_DEF, UPDATE_USER_PROFILE_TOOL_DEF]
-        openai_tools = [t.to_openai_function() for t in tool_defs]
-
         await emit("calling_llm", message="Добавляю событие…")
         response = await chat_completion(
             messages,
-            tools=openai_tools,
+            tools=_OPENAI_TOOLS,
             base_url=agent_params.get("base_url"),
             model=agent_params.get("model"),
             api_key=agent_params.get("api_key") or None,
@@ -92,42 +109,47 @@ class EventExecutor(BaseChatExecutor):
             max_tokens=agent_params.get("max_tokens", 8096),
         )
 
-        message = response.get("message", response)
-        if isinstance(message, dict):
-            tool_calls = message.get("tool_calls", [])
-        else:
-            tool_calls = []
+        tool_calls = extract_tool_calls(response)
 
         if not tool_calls:
             await emit("done", affected_ids=affected_ids, created_ids=created_ids, created_note_ids=created_ids)
             return affected_ids, created_ids, None
 
-        for tc in tool_calls:
-            fn = tc.get("function", {})
-            name = fn.get("name")
-            args_str = fn.get("arguments", "{}")
-            if name not in TOOLS:
-                continue
-            try:
-                json.loads(args_str)
-            except json.JSONDecodeError as e:
-                logger.error("EventExecutor: tool args parse error", extra={"name": name, "error": str(e)})
-                continue
-
-            await emit("executing_tool", tool=name, message=TOOL_DISPLAY.get(name, name))
-            await self._execute_tool(
-                tool_name=name,
-                raw_args=args_str,
-                tool_call_id=f"tc_{name}",
-                extra_context={
-                    "user_id": user_id,
-                    "db": db,
-                    "created_ids": created_ids,
-                    "affected_ids": affected_ids,
-                },
-            )
+        await self._leave_deadline()
+        async with self._side_tasks() as side_tasks:
+            for tc in tool_calls:
+                fn = tc.get("function", {})
+                name = fn.get("name")
+                args_str = fn.get("arguments", "{}")
+                label = _TOOL_LABELS.get(name)
+                if label is None:
+                    continue
+                try:
+                    args = json.loads(args_str)
+                except json.JSONDecodeError as e:
+                    logger.error("EventExecutor: tool args parse error", extra={"name": name, "error": str(e)})
+                    continue
+
+                await emit("executing_tool", tool=name, message=label)
+                if name in _ISOLATED_TOOLS:
+                    side_tasks.append(self._start_isolated_tool(name, args_str, args, user_id))
+                    continue
+                await self._execute_tool(
+                    tool_name=name,
+                    raw_args=args_str,
+                    parsed_args=args,
+                    tool_call_id=f"tc_{name}",
+                    extra_context={
+                        "user_id": user_id,
+                        "db": db,
+                        "created_ids": created_ids,
+                        "affected_ids": affected_ids,
+                    },
+                )
+
+            await asyncio.gather(*side_tasks)
 
         await emit("saving", message="Сохраняю…")
-        await db.commit()
+        await self._commit_turn(db)
         await emit("done", affected_ids=affected_ids, created_ids=created_ids, created_note_ids=created_ids)
         return affected_ids, created_ids, None
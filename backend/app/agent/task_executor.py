@@ -1,15 +1,14 @@
 """Task executor: create tasks (no date/time). Tools: create_task, update_user_profile."""
 
+import asyncio
 import json
 import logging
 from typing import Any
 
-from app.agent.base_executor import BaseChatExecutor
+from app.agent.base_executor import _ISOLATED_TOOLS, BaseChatExecutor, make_emit, today_str
 from app.agent.tools.notes_tool_def import UPDATE_USER_PROFILE_TOOL_DEF
 from app.agent.tools.task_tool_def import CREATE_TASK_TOOL_DEF
-from app.services.agent import build_context
-from app.services.agent_settings_service import get_agent_settings
-from app.services.llm import chat_completion
+from app.services.llm import chat_completion, extract_tool_calls
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +21,9 @@ TOOLS = {
     "create_task": CREATE_TASK_TOOL_DEF,
     "update_user_profile": UPDATE_USER_PROFILE_TOOL_DEF,
 }
+_OPENAI_TOOLS = tuple(t.to_openai_function() for t in TOOLS.values())
+# Tool name -> progress label; membership doubles as the "known tool" check
+_TOOL_LABELS = {name: TOOL_DISPLAY.get(name, name) for name in TOOLS}
 
 SYSTEM_PROMPT = """Ты — агент задач. Пользователь просит создать ЗАДАЧУ (без даты/времени).
 
@@ -34,6 +36,7 @@ SYSTEM_PROMPT = """Ты — агент задач. Пользователь пр
 
 После create_task — ОБЯЗАТЕЛЬНО проверь: есть ли в запросе сфера (работа, компания, проект, категория). Если да и её нет в «Известно о пользователе» — вызови update_user_profile.
 Отвечай ТОЛЬКО вызовами инструментов."""
+_SYS_PREFIX = SYSTEM_PROMPT + "\n\nСегодня: "
 
 
 class TaskExecutor(BaseChatExecutor):
@@ -54,16 +57,14 @@ class TaskExecutor(BaseChatExecutor):
         on_event: Any = None,
     ) -> tuple[list[int], list[int], str | None]:
         """Execute one turn. Returns (affected_ids, created_ids, skipped_reason)."""
-        async def emit(phase: str, **data: Any) -> None:
-            if on_event:
-                await on_event(phase, data)
+        emit = make_emit(on_event)
 
         await emit("building_context", message="Загрузка контекста…")
-        context, profile_block = await build_context(db, user_id, note_id=note_id)
+        context, profile_block, agent_params = await self._load_context(
+            db, user_id, agent_params, note_id=note_id
+        )
 
-        from datetime import datetime, timezone
-        today_str = datetime.now(timezone.utc).strftime("%Y-%m-%d, %A")
-        system_content = SYSTEM_PROMPT + f"\n\nСегодня: {today_str}" + profile_block
+        system_content = f"{_SYS_PREFIX}{today_str()}{profile_block}"
 
         messages = [
             {"role": "system", "content": system_content},
@@ -73,16 +74,10 @@ class TaskExecutor(BaseChatExecutor):
         affected_ids: list[int] = []
         created_ids: list[int] = []
 
-        if agent_params is None:
-            agent_params = await get_agent_settings(db, user_id, "notes")
-
-        tool_defs = [CREATE_TASK_TOOL_DEF, UPDATE_USER_PROFILE_TOOL_DEF]
-        openai_tools = [t.to_openai_function() for t in tool_defs]
-
         await emit("calling_llm", message="Создаю задачу…")
         response = await chat_completion(
             messages,
-            tools=openai_tools,
+            tools=_OPENAI_TOOLS,
             base_url=agent_params.get("base_url"),
             model=agent_params.get("model"),
             api_key=agent_params.get("api_key") or None,
@@ -92,42 +87,47 @@ class TaskExecutor(BaseChatExecutor):
             max_tokens=agent_params.get("max_tokens", 8096),
         )
 
-        message = response.get("message", response)
-        if isinstance(message, dict):
-            tool_calls = message.get("tool_calls", [])
-        else:
-            tool_calls = []
+        tool_calls = extract_tool_calls(response)
 
         if not tool_calls:
             await emit("done", affected_ids=affected_ids, created_ids=created_ids, created_note_ids=created_ids)
             return affected_ids, created_ids, None
 
-        for tc in tool_calls:
-            fn = tc.get("function", {})
-            name = fn.get("name")
-            args_str = fn.get("arguments", "{}")
-            if name not in TOOLS:
-                continue
-            try:
-                json.loads(args_str)
-            except json.JSONDecodeError as e:
-                logger.error("TaskExecutor: tool args parse error", extra={"name": name, "error": str(e)})
-                continue
-
-            await emit("executing_tool", tool=name, message=TOOL_DISPLAY.get(name, name))
-            await self._execute_tool(
-                tool_name=name,
-                raw_args=args_str,
-                tool_call_id=f"tc_{name}",
-                extra_context={
-                    "user_id": user_id,
-                    "db": db,
-                    "created_ids": created_ids,
-                    "affected_ids": affected_ids,
-                },
-            )
+        await self._leave_deadline()
+        async with self._side_tasks() as side_tasks:
+            for tc in tool_calls:
+                fn = tc.get("function", {})
+                name = fn.get("name")
+                args_str = fn.get("arguments", "{}")
+                label = _TOOL_LABELS.get(name)
+                if label is None:
+                    continue
+                try:
+                    args = json.loads(args_str)
+                except json.JSONDecodeError as e:
+                    logger.error("TaskExecutor: tool args parse error", extra={"name": name, "error": str(e)})
+                    continue
+
+                await emit("executing_tool", tool=name, message=label)
+                if name in _ISOLATED_TOOLS:
+                    side_tasks.append(self._start_isolated_tool(name, args_str, args, user_id))
+                    continue
+                await self._execute_tool(
+                    tool_name=name,
+                    raw_args=args_str,
+                    parsed_args=args,
+                    tool_call_id=f"tc_{name}",
+                    extra_context={
+                        "user_id": user_id,
+                        "db": db,
+                        "created_ids": created_ids,
+                        "affected_ids": affected_ids,
+                    },
+                )
+
+            await asyncio.gather(*side_tasks)
 
         await emit("saving", message="Сохраняю…")
-        await db.commit()
+        await self._commit_turn(db)
         await emit("done", affected_ids=affected_ids, created_ids=created_ids, created_note_ids=created_ids)
         return affected_ids, created_ids, None
@@ -67,8 +67,8 @@ class CreateNoteWithEventTool(BaseTool):
                 )
                 return "Error: folder not found"
         try:
-            starts_dt = datetime.fromisoformat(starts_at.replace("Z", "+00:00"))
-            ends_dt = datetime.fromisoformat(ends_at.replace("Z", "+00:00"))
+            starts_dt = datetime.fromisoformat(starts_at)
+            ends_dt = datetime.fromisoformat(ends_at)
         except (ValueError, TypeError) as e:
             logger.error(
                 "CreateNoteWithEventTool: invalid datetime",
@@ -89,7 +89,7 @@ class CreateNoteWithEventTool(BaseTool):
         await db.flush()
         content_full = f"Создано: {_ts()}\n\n{content}"
         workspace.set_content(user_id, note.id, content_full)
-        search.index_note(user_id, note.id, note.title, content_full)
+        search.schedule_index(user_id, note.id, note.title, content_full)
         event = Event(
             user_id=user_id,
             note_id=note.id,
@@ -3,6 +3,7 @@
 import difflib
 import json
 import logging
+import re
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING, Any
 
@@ -73,30 +74,68 @@ async def _get_folder_for_user(db: "AsyncSession", folder_id: int, user_id: int)
     return result.scalar_one_or_none()
 
 
-async def _get_note_for_user(db: "AsyncSession", note_id: int, user_id: int):
+async def get_note_identity_for_user(db: "AsyncSession", note_id: int, user_id: int):
+    """(id, title) row of the user's live note, or None. No ORM entity is loaded; shared by the note and tag tools."""
     from sqlalchemy import select
 
     result = await db.execute(
-        select(Note).where(
+        select(Note.id, Note.title).where(
             Note.id == note_id,
             Note.user_id == user_id,
             Note.deleted_at.is_(None),
         )
     )
-    return result.scalar_one_or_none()
+    return result.first()
+
+
+async def _touch_note(db: "AsyncSession", note_id: int, now: datetime) -> None:
+    from sqlalchemy import update
+
+    await db.execute(update(Note).where(Note.id == note_id).values(updated_at=now))
+
+
+def _closest_line(old_text: str, lines: list[str]) -> str | None:
+    """Most similar line (difflib similarity >= 0.7)."""
+    n = len(old_text)
+    # ratio <= 2*min(len)/(len sum): lines this far off in length can never reach 0.7
+    candidates = [line for line in lines if 2 * min(n, len(line)) >= 0.7 * (n + len(line))]
+    # old_text is indexed (b2j) once; the cutoff rises to the best ratio seen so far
+    sm = difflib.SequenceMatcher()
+    sm.set_seq2(old_text)
+    best_ratio, best_line = 0.7, None
+    for line in candidates:
+        sm.set_seq1(line)
+        if sm.real_quick_ratio() < best_ratio or sm.quick_ratio() < best_ratio:
+            continue
+        r = sm.ratio()
+        if r > best_ratio or (best_line is None and r >= best_ratio):
+            best_ratio, best_line = r, line
+    return best_line
+
+
+def _find_loose(content: str, old_text: str) -> re.Match[str] | None:
+    """Case-insensitive match, then one that also ignores whitespace differences."""
+    m = re.search(re.escape(old_text), content, re.IGNORECASE)
+    if m is None:
+        words = old_text.split()
+        if words:
+            m = re.search(r"\s+".join(map(re.escape, words)), content, re.IGNORECASE)
+    return m
 
 
 def _execute_patch_note(content: str, old_text: str, new_text: str) -> str:
     if old_text in content:
         return content.replace(old_text, new_text, 1)
-    lines = content.splitlines()
-    close = difflib.get_close_matches(old_text, lines, n=1, cutoff=0.7)
-    if close:
+    m = _find_loose(content, old_text)
+    if m is not None:
+        return content[: m.start()] + new_text + content[m.end() :]
+    close = _closest_line(old_text, content.splitlines())
+    if close is not None:
         logger.warning(
             "patch_note: used difflib fallback",
             extra={"old_preview": old_text[:50]},
         )
-        return content.replace(close[0], new_text, 1)
+        return content.replace(close, new_text, 1)
     logger.warning(
         "patch_note: fragment not found",
         extra={"old_preview": old_text[:50]},
@@ -169,7 +208,7 @@ class CreateNoteTool(BaseTool):
         await db.flush()
         content_full = f"Создано: {_ts()}\n\n{content}"
         workspace.set_content(user_id, note.id, content_full)
-        search.index_note(user_id, note.id, note.title, content_full)
+        search.schedule_index(user_id, note.id, note.title, content_full)
         if created_ids is not None:
             created_ids.append(note.id)
         if affected_ids is not None:
@@ -190,18 +229,19 @@ class AppendToNoteTool(BaseTool):
         affected_ids: list[int] | None = None,
         **kwargs: object,
     ) -> str:
-        note = await _get_note_for_user(db, note_id, user_id)
+        note = await get_note_identity_for_user(db, note_id, user_id)
         if note is None:
             logger.warning(
                 "AppendToNoteTool: note not found",
                 extra={"note_id": note_id},
             )
             return "Error: note not found"
-        cur = workspace.get_content(user_id, note.id)
-        new_content = (cur or "") + f"\n\n--- {_ts()} ---\n\n" + content
+        now = datetime.now(timezone.utc)
+        cur = workspace.get_content(user_id, note.id) or ""
+        new_content = cur + f"\n\n--- {now.strftime(TS_FMT)} ---\n\n" + content
         workspace.set_content(user_id, note.id, new_content)
-        search.index_note(user_id, note.id, note.title, new_content)
-        note.updated_at = datetime.now(timezone.utc).replace(tzinfo=None)
+        search.schedule_index(user_id, note.id, note.title, new_content, prev_len=len(cur))
+        await _touch_note(db, note.id, now)
         if affected_ids is not None:
             affected_ids.append(note.id)
         return f"Appended to note id={note_id}"
@@ -223,7 +263,7 @@ class PatchNoteTool(BaseTool):
     ) -> str:
         if not old_text:
             return "Error: old_text required"
-        note = await _get_note_for_user(db, note_id, user_id)
+        note = await get_note_identity_for_user(db, note_id, user_id)
         if note is None:
             logger.warning(
                 "PatchNoteTool: note not found",
@@ -232,9 +272,10 @@ class PatchNoteTool(BaseTool):
             return "Error: note not found"
         cur = workspace.get_content(user_id, note.id)
         new_content = _execute_patch_note(cur, old_text, new_text)
-        workspace.set_content(user_id, note.id, new_content)
-        search.index_note(user_id, note.id, note.title, new_content)
-        note.updated_at = datetime.now(timezone.utc).replace(tzinfo=None)
+        if new_content != cur:
+            workspace.set_content(user_id, note.id, new_content)
+            search.schedule_index(user_id, note.id, note.title, new_content)
+            await _touch_note(db, note.id, datetime.now(timezone.utc))
         if affected_ids is not None:
             affected_ids.append(note.id)
         return f"Patched note id={note_id}"
@@ -251,7 +292,7 @@ class RequestNoteSelectionTool(BaseTool):
         candidates: list,
         **kwargs: object,
     ) -> str:
-        validated: list[dict[str, Any]] = []
+        requested: list[tuple[int, str]] = []
         for c in (candidates or [])[:20]:
             nid = c.get("note_id") if isinstance(c, dict) else getattr(c, "note_id", None)
             title = (c.get("title") or "") if isinstance(c, dict) else (getattr(c, "title", None) or "")
@@ -261,9 +302,23 @@ class RequestNoteSelectionTool(BaseTool):
                 nid = int(nid)
             except (TypeError, ValueError):
                 continue
-            note = await _get_note_for_user(db, nid, user_id)
-            if note is not None:
-                validated.append({"note_id": nid, "title": title or note.title})
+            requested.append((nid, title))
+        if not requested:
+            return json.dumps({"candidates": []})
+
+        from sqlalchemy import select
+
+        result = await db.execute(
+            select(Note.id, Note.title).where(
+                Note.id.in_({nid for nid, _ in requested}),
+                Note.user_id == user_id,
+                Note.deleted_at.is_(None),
+            )
+        )
+        found: dict[int, str] = dict(result.all())
+        validated: list[dict[str, Any]] = [
+            {"note_id": nid, "title": title or found[nid]} for nid, title in requested if nid in found
+        ]
         return json.dumps({"candidates": validated}, ensure_ascii=False)
 
 
@@ -281,16 +336,26 @@ class UpdateUserProfileTool(BaseTool):
         fact = fact.strip()
         if not fact:
             return "No fact to add"
-        from sqlalchemy import select
-
-        existing = await db.execute(
-            select(UserProfileFact.fact).where(UserProfileFact.user_id == user_id)
+        from sqlalchemy import func, select
+
+        # Same expression as uq_upf_user_normfact, so the lookup is a single index probe
+        exists_stmt = (
+            select(1)
+            .where(
+                UserProfileFact.user_id == user_id,
+                func.lower(func.btrim(UserProfileFact.fact)) == fact.lower(),
+            )
+            .limit(1)
         )
-        existing_facts = {r[0].strip().lower() for r in existing.all()}
-        fact_normalized = fact.lower()
-        if fact_normalized not in existing_facts:
-            db.add(UserProfileFact(user_id=user_id, fact=fact))
-            await db.flush()
+        if (await db.execute(exists_stmt)).scalar() is None:
+            from sqlalchemy.exc import IntegrityError
+
+            try:
+                # Savepoint: a concurrent insert of the same fact trips uq_upf_user_normfact
+                async with db.begin_nested():
+                    db.add(UserProfileFact(user_id=user_id, fact=fact))
+            except IntegrityError:
+                return "Profile updated"
             logger.info(
                 "UpdateUserProfileTool: added fact",
                 extra={"user_id": user_id, "fact_preview": fact[:50]},
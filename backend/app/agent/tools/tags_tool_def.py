@@ -2,6 +2,7 @@
 
 import json
 import logging
+import re
 from typing import TYPE_CHECKING
 
 from pydantic import BaseModel, Field
@@ -10,13 +11,17 @@ if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.agent.tools.base_tool import BaseTool
-from app.models import Note, NoteTag, Tag
+from app.agent.tools.notes_tool_def import get_note_identity_for_user
+from app.models import NoteTag, Tag
 from app.services import workspace
 from app.services.agent_settings_service import get_agent_settings
 from app.services.llm import chat_completion
 
 logger = logging.getLogger(__name__)
 
+# Markdown code fence around the model's JSON: ```json ... ``` (language tag optional)
+_FENCE_RE = re.compile(r"^```[a-zA-Z]*\s*|\s*```$")
+
 
 class SuggestTagsParams(BaseModel):
     """Suggest tags for a note based on its content."""
@@ -43,16 +48,7 @@ class SuggestTagsTool(BaseTool):
         agent_params: dict | None = None,
         **kwargs: object,
     ) -> str:
-        from sqlalchemy import select
-
-        result = await db.execute(
-            select(Note).where(
-                Note.id == note_id,
-                Note.user_id == user_id,
-                Note.deleted_at.is_(None),
-            )
-        )
-        note = result.scalar_one_or_none()
+        note = await get_note_identity_for_user(db, note_id, user_id)
         if note is None:
             logger.warning("SuggestTagsTool: note not found", extra={"note_id": note_id})
             return json.dumps({"tag_names": []})
@@ -79,12 +75,13 @@ class SuggestTagsTool(BaseTool):
             temperature=0.3,
             max_tokens=256,
         )
-        raw = resp.get("choices", [{}])[0].get("message", {}).get("content", "{}") or "{}"
+        # chat_completion returns the first choice itself
+        raw = (resp.get("message") or {}).get("content") or "{}"
         try:
-            parsed = json.loads(raw.strip().removeprefix("```json").removesuffix("```").strip())
-            names = parsed.get("tag_names", [])
+            parsed = json.loads(_FENCE_RE.sub("", raw.strip()))
+            names = parsed.get("tag_names", []) if isinstance(parsed, dict) else []
             if isinstance(names, list):
-                names = [str(n).strip() for n in names if n][:5]
+                names = list(dict.fromkeys(t for t in (str(n).strip() for n in names if n) if t))[:5]
             else:
                 names = []
         except (json.JSONDecodeError, TypeError) as e:
@@ -107,36 +104,51 @@ class AddTagsToNoteTool(BaseTool):
         **kwargs: object,
     ) -> str:
         from sqlalchemy import select
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
 
-        note_result = await db.execute(
-            select(Note).where(Note.id == note_id, Note.user_id == user_id, Note.deleted_at.is_(None))
-        )
-        note = note_result.scalar_one_or_none()
-        if note is None:
+        if await get_note_identity_for_user(db, note_id, user_id) is None:
             logger.warning("AddTagsToNoteTool: note not found", extra={"note_id": note_id})
             return "Error: note not found"
 
+        names = list(dict.fromkeys(n for n in ((x or "").strip() for x in tag_names) if n))
         added: list[str] = []
-        for name in tag_names:
-            name = (name or "").strip()
-            if not name:
-                continue
-            tag_result = await db.execute(
-                select(Tag).where(Tag.user_id == user_id, Tag.name == name)
+        if names:
+            # Fixed number of round-trips regardless of len(names): lookup, insert missing, lookup links, link
+            tag_ids: dict[str, int] = dict(
+                (await db.execute(select(Tag.name, Tag.id).where(Tag.user_id == user_id, Tag.name.in_(names)))).all()
             )
-            tag = tag_result.scalar_one_or_none()
-            if tag is None:
-                tag = Tag(user_id=user_id, name=name)
-                db.add(tag)
-                await db.flush()
+            missing = [n for n in names if n not in tag_ids]
+            if missing:
+                created = await db.execute(
+                    pg_insert(Tag)
+                    .values([{"user_id": user_id, "name": n} for n in missing])
+                    .on_conflict_do_nothing(index_elements=["user_id", "name"])
+                    .returning(Tag.name, Tag.id)
+                )
+                new_ids = dict(created.all())
+                tag_ids.update(new_ids)
                 if affected_ids is not None:
-                    affected_ids.append(tag.id)
-            existing = await db.execute(
-                select(NoteTag).where(NoteTag.note_id == note_id, NoteTag.tag_id == tag.id)
+                    affected_ids.extend(new_ids.values())
+                if len(tag_ids) < len(names):
+                    # Lost an insert race to a concurrent request: those rows exist now
+                    rest = [n for n in names if n not in tag_ids]
+                    tag_ids.update(
+                        (await db.execute(select(Tag.name, Tag.id).where(Tag.user_id == user_id, Tag.name.in_(rest)))).all()
+                    )
+            linked = set(
+                (
+                    await db.execute(
+                        select(NoteTag.tag_id).where(NoteTag.note_id == note_id, NoteTag.tag_id.in_(list(tag_ids.values())))
+                    )
+                ).scalars()
             )
-            if existing.scalar_one_or_none() is None:
-                db.add(NoteTag(note_id=note_id, tag_id=tag.id))
-                added.append(name)
+            added = [n for n in names if n in tag_ids and tag_ids[n] not in linked]
+            if added:
+                await db.execute(
+                    pg_insert(NoteTag)
+                    .values([{"note_id": note_id, "tag_id": tag_ids[n]} for n in added])
+                    .on_conflict_do_nothing()
+                )
 
         if affected_ids is not None:
             affected_ids.append(note_id)
@@ -9,7 +9,7 @@ from pydantic import BaseModel, Field
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
 
-from sqlalchemy import select
+from sqlalchemy import and_, or_, select
 
 from app.agent.tools.base_tool import BaseTool
 from app.agent.tools.tool_def import ToolDefinition
@@ -41,49 +41,41 @@ class CreateTaskParams(BaseModel):
     subtasks: list[SubtaskItem] | None = None
 
 
-async def _get_or_create_tasks_folder(db: "AsyncSession", user_id: int) -> Folder:
-    result = await db.execute(
-        select(Folder).where(
-            Folder.user_id == user_id,
-            Folder.name == TASKS_FOLDER_NAME,
-            Folder.parent_folder_id.is_(None),
-        )
-    )
-    folder = result.scalar_one_or_none()
-    if folder is not None:
-        return folder
-    folder = Folder(
-        user_id=user_id,
-        name=TASKS_FOLDER_NAME,
-        parent_folder_id=None,
-        order_index=0,
-    )
-    db.add(folder)
-    await db.flush()
-    logger.info("Created tasks folder", extra={"user_id": user_id, "folder_id": folder.id})
-    return folder
-
-
-async def _get_or_create_task_category(
-    db: "AsyncSession", parent_folder: Folder, category_name: str, user_id: int
-) -> Folder:
+async def _get_or_create_task_folder(db: "AsyncSession", user_id: int, category_name: str) -> Folder:
+    """Target folder for a task: «Задачи»/<category>, or «Задачи» itself. Existing folders cost one SELECT."""
     name = category_name.strip() if category_name else ""
-    if not name:
-        return parent_folder
-    result = await db.execute(
-        select(Folder).where(
-            Folder.user_id == user_id,
-            Folder.parent_folder_id == parent_folder.id,
-            Folder.name == name,
-        )
+    roots = select(Folder.id).where(
+        Folder.user_id == user_id,
+        Folder.name == TASKS_FOLDER_NAME,
+        Folder.parent_folder_id.is_(None),
     )
-    folder = result.scalar_one_or_none()
+    cond = Folder.id.in_(roots)
+    if name:
+        cond = or_(cond, and_(Folder.parent_folder_id.in_(roots), Folder.name == name))
+    result = await db.execute(select(Folder).where(Folder.user_id == user_id, cond).order_by(Folder.id))
+    folders = result.scalars().all()
+
+    tasks_folder = next((f for f in folders if f.parent_folder_id is None), None)
+    if tasks_folder is None:
+        tasks_folder = Folder(
+            user_id=user_id,
+            name=TASKS_FOLDER_NAME,
+            parent_folder_id=None,
+            order_index=0,
+        )
+        db.add(tasks_folder)
+        await db.flush()
+        logger.info("Created tasks folder", extra={"user_id": user_id, "folder_id": tasks_folder.id})
+    if not name:
+        return tasks_folder
+
+    folder = next((f for f in folders if f.parent_folder_id == tasks_folder.id), None)
     if folder is not None:
         return folder
     folder = Folder(
         user_id=user_id,
         name=name,
-        parent_folder_id=parent_folder.id,
+        parent_folder_id=tasks_folder.id,
         order_index=0,
     )
     db.add(folder)
@@ -113,19 +105,14 @@ class CreateTaskTool(BaseTool):
     ) -> str:
         if not title:
             return "Error: title required"
-        tasks_folder = await _get_or_create_tasks_folder(db, user_id)
-        target_folder = await _get_or_create_task_category(
-            db, tasks_folder, category or "", user_id
-        )
+        target_folder = await _get_or_create_task_folder(db, user_id, category or "")
         subtasks_data: list[dict[str, Any]] | None = None
         if isinstance(subtasks, list) and subtasks:
-            subtasks_data = []
-            for st in subtasks:
-                if isinstance(st, dict) and st.get("text"):
-                    subtasks_data.append({
-                        "text": st["text"],
-                        "done": bool(st.get("done", False)),
-                    })
+            subtasks_data = [
+                {"text": text, "done": bool(st.get("done", False))}
+                for st in subtasks
+                if isinstance(st, dict) and (text := st.get("text"))
+            ]
         note = Note(
             user_id=user_id,
             folder_id=target_folder.id,
@@ -138,7 +125,7 @@ class CreateTaskTool(BaseTool):
         await db.flush()
         content_full = f"Создано: {_ts()}\n\n{content}"
         workspace.set_content(user_id, note.id, content_full)
-        search.index_note(user_id, note.id, note.title, content_full)
+        search.schedule_index(user_id, note.id, note.title, content_full)
         if created_ids is not None:
             created_ids.append(note.id)
         if affected_ids is not None:
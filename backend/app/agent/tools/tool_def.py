@@ -1,11 +1,14 @@
 """Tool definitions with Pydantic params and OpenAI schema."""
 
+import asyncio
+import functools
+import heapq
 import json
 import logging
-import re
+from operator import itemgetter
 from typing import TYPE_CHECKING, Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
@@ -35,21 +38,16 @@ class ReadNotesParams(BaseModel):
     note_ids: list[int] = Field(..., min_length=1, max_length=10)
 
 
+# Query separators , ; \n folded to "," so a plain str.split does the work of re.split
+_TO_COMMA = str.maketrans({";": ",", "\n": ","})
+
+
 def _normalize_queries(raw: Any) -> list[str]:
     """Normalize model output to flat list of query strings."""
-    result: list[str] = []
     if raw is None:
-        return result
+        return []
     items = raw if isinstance(raw, list) else [raw]
-    for x in items:
-        s = str(x).strip() if x is not None else ""
-        if not s:
-            continue
-        for p in re.split(r"[,;\n]+", s):
-            q = p.strip()
-            if q:
-                result.append(q)
-    return result
+    return [q for x in items if x is not None for p in str(x).translate(_TO_COMMA).split(",") if (q := p.strip())]
 
 
 class SearchNotesTool(BaseTool):
@@ -86,22 +84,27 @@ class SearchNotesTool(BaseTool):
             if r.get("snippet") and not seen[nid]["snippet"]:
                 seen[nid]["snippet"] = r["snippet"]
 
-        if exact_queries:
-            try:
-                results = search.search_notes_union(user_id, exact_queries, limit=10)
-                for rank, r in enumerate(results):
-                    add(rank, r)
-            except Exception as e:
-                logger.warning("Search exact_union failed", extra={"queries": exact_queries[:5], "error": str(e)})
-        if semantic_queries:
-            try:
-                results = search.search_notes_union(user_id, semantic_queries, limit=10)
-                for rank, r in enumerate(results):
-                    add(rank + (len(exact_queries or []) * 10), r)
-            except Exception as e:
-                logger.warning("Search semantic_union failed", extra={"queries": semantic_queries[:5], "error": str(e)})
-
-        sorted_res = sorted(seen.values(), key=lambda x: -x["score"])[:15]
+        # (label, queries, rank offset); both unions are blocking Redis + embedding calls, run side by side
+        runs = [
+            (label, queries, offset)
+            for label, queries, offset in (
+                ("exact_union", exact_queries, 0),
+                ("semantic_union", semantic_queries, len(exact_queries or []) * 10),
+            )
+            if queries
+        ]
+        outcomes = await asyncio.gather(
+            *(asyncio.to_thread(search.search_notes_union, user_id, queries, limit=10) for _, queries, _ in runs),
+            return_exceptions=True,
+        )
+        for (label, queries, offset), results in zip(runs, outcomes):
+            if isinstance(results, Exception):
+                logger.warning("Search %s failed", label, extra={"queries": queries[:5], "error": str(results)})
+                continue
+            for rank, r in enumerate(results):
+                add(rank + offset, r)
+
+        sorted_res = heapq.nlargest(15, seen.values(), key=itemgetter("score"))
         logger.info(
             "search_notes: merged",
             extra={"total_unique": len(seen), "returned": len(sorted_res)},
@@ -162,6 +165,12 @@ class ReadNotesTool(BaseTool):
         return json.dumps(out, ensure_ascii=False)
 
 
+@functools.cache
+def json_schema(model: type[BaseModel]) -> dict[str, Any]:
+    """model_json_schema() memoized per model class — schemas are static. Callers must not mutate the result."""
+    return model.model_json_schema()
+
+
 class ToolDefinition:
     """Tool metadata: OpenAI schema, validation, execution."""
 
@@ -178,20 +187,33 @@ class ToolDefinition:
         self.parameters_model = parameters_model
         self.instance = instance
         self.timeout_seconds = timeout_seconds
-
-    def to_openai_function(self) -> dict:
-        schema = self.parameters_model.model_json_schema()
-        return {
+        self._field_names = tuple(parameters_model.model_fields)
+        self._validator = TypeAdapter(parameters_model)
+        schema = json_schema(parameters_model)
+        # Nested models ($defs) still need model_dump() so tools receive plain dicts
+        self._needs_dump = "$defs" in schema
+        self._openai_function: dict = {
             "type": "function",
             "function": {
-                "name": self.tool_id,
-                "description": self.description,
+                "name": tool_id,
+                "description": description,
                 "parameters": schema,
             },
         }
 
+    def to_openai_function(self) -> dict:
+        """OpenAI function schema, built at definition time; callers must not mutate it."""
+        return self._openai_function
+
     def validate_args(self, args: dict) -> BaseModel:
-        return self.parameters_model.model_validate(args)
+        return self._validator.validate_python(args)
+
+    def validate_kwargs(self, args: dict) -> dict[str, Any]:
+        """Validate args and return them as call kwargs (fresh dict, safe to update)."""
+        validated = self._validator.validate_python(args)
+        if self._needs_dump:
+            return validated.model_dump()
+        return {name: getattr(validated, name) for name in self._field_names}
 
 
 SEARCH_NOTES_TOOL_DEF = ToolDefinition(
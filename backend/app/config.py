@@ -1,3 +1,6 @@
+from functools import cached_property
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -5,6 +8,9 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
 
     database_url: str
+    # Startup migrations: sync = before serving; async = in background, API answers 503 until done;
+    # skip = not run by the app (one-shot migrator job)
+    migration_mode: Literal["sync", "async", "skip"] = "sync"
 
     secret_key: str
     access_token_expire_minutes: int = 10080
@@ -25,6 +31,20 @@ class Settings(BaseSettings):
     vllm_top_p: float = 1.0
     vllm_max_tokens: int = 16384
 
+    # Postgres group commit: with >=2 other open transactions, a committing backend waits this long
+    # so their commits share one WAL flush (commit_delay; 0 = off, max 100 ms; needs superuser/SET privilege)
+    agent_group_commit_ms: int = 0
+    # Agent turns commit with synchronous_commit=off (no WAL fsync wait; a crash can drop the last turns)
+    agent_async_commit: bool = False
+    # Classify empty/very short, explicitly dated and list-shaped inputs without the LLM
+    agent_heuristic_intent: bool = False
+    # Event turns whose input has no date/time marker are answered without the LLM call
+    agent_event_datetime_filter: bool = False
+    # Coalesce concurrent intent classifications into one LLM call (mixes different users' inputs in one prompt)
+    agent_intent_batching: bool = False
+    # Upper bound for context load + LLM call of one notes/task/event turn; once tools start the turn runs to completion; 0 = no limit
+    agent_turn_timeout_sec: float = 180.0
+
     whisper_model: str = "distil-large-v3"
     whisper_language: str = "ru"
     whisper_cache_dir: str | None = None
@@ -37,9 +57,10 @@ class Settings(BaseSettings):
 
     cors_origins: str = "http://localhost,http://localhost:3000"
 
-    @property
+    @cached_property
     def cors_origins_list(self) -> list[str]:
-        return [o.strip() for o in self.cors_origins.split(",") if o.strip()]
+        """CORS_ORIGINS parsed once per Settings instance (the CSV is not re-split on each access)."""
+        return [o for o in (x.strip() for x in self.cors_origins.split(",")) if o]
 
 
 settings = Settings()
@@ -1,8 +1,13 @@
+import logging
+
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
 engine = create_async_engine(
     settings.database_url,
     echo=False,
@@ -10,6 +15,25 @@ engine = create_async_engine(
     pool_recycle=300,
 )
 
+if settings.agent_group_commit_ms > 0:
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_commit_delay(dbapi_connection, connection_record) -> None:
+        """Enable server-side group commit for every pooled connection."""
+        delay_us = min(settings.agent_group_commit_ms * 1000, 100_000)
+        autocommit = dbapi_connection.autocommit
+        dbapi_connection.autocommit = True
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute(f"SET commit_delay = {delay_us}")
+            cursor.execute("SET commit_siblings = 2")
+        except Exception as e:
+            logger.warning("database: commit_delay not applied", extra={"error": str(e)})
+        finally:
+            cursor.close()
+            dbapi_connection.autocommit = autocommit
+
+
 async_session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
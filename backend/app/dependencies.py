@@ -1,4 +1,6 @@
 import logging
+import time
+from dataclasses import dataclass
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
@@ -14,10 +16,25 @@ logger = logging.getLogger(__name__)
 security = HTTPBearer()
 
 
+@dataclass(frozen=True, slots=True)
+class CurrentUser:
+    """Authenticated user as seen by request handlers; immutable, so one instance can serve concurrent requests."""
+
+    id: int
+    email: str
+
+
+# user_id -> (expires_at, CurrentUser). Per-process; users are never updated or deleted through the API,
+# and a user removed directly in the DB keeps access for up to _USER_CACHE_TTL_SEC.
+_USER_CACHE_TTL_SEC = 60.0
+_USER_CACHE_MAX = 10_000
+_user_cache: dict[int, tuple[float, CurrentUser]] = {}
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_db),
-) -> User:
+) -> CurrentUser:
     token = credentials.credentials
     try:
         token_data = decode_token(token)
@@ -32,11 +49,19 @@ async def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token",
         )
-    result = await db.execute(select(User).where(User.id == token_data.user_id))
-    user = result.scalar_one_or_none()
-    if user is None:
+    now = time.monotonic()
+    hit = _user_cache.get(token_data.user_id)
+    if hit is not None and hit[0] > now:
+        return hit[1]
+    result = await db.execute(select(User.id, User.email).where(User.id == token_data.user_id))
+    row = result.one_or_none()
+    if row is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
         )
+    user = CurrentUser(id=row.id, email=row.email)
+    if len(_user_cache) >= _USER_CACHE_MAX:
+        _user_cache.pop(next(iter(_user_cache)))
+    _user_cache[user.id] = (now + _USER_CACHE_TTL_SEC, user)
     return user
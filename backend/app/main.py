@@ -5,14 +5,14 @@ from contextlib import asynccontextmanager
 
 from alembic import command
 from alembic.config import Config
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from sqlalchemy import select
 
 from app.config import settings
-from app.database import async_session_maker
+from app.database import async_session_maker, engine
 from app.models import Note
 from app.routers import agent, auth, batch_notes, chat, events, export_router, folders, notes, saved_messages, search as search_router, tags, tasks, transcribe, websocket
 from slowapi import _rate_limit_exceeded_handler
@@ -34,55 +34,107 @@ logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: migrations, then load Whisper model
-    def _run_migrations() -> None:
+    # Startup: migrations, embedding model, search reindex
+    def _upgrade(sync_conn) -> None:
         alembic_cfg = Config("alembic.ini")
+        alembic_cfg.attributes["connection"] = sync_conn
         command.upgrade(alembic_cfg, "head")
 
-    loop = asyncio.get_event_loop()
-    await loop.run_in_executor(None, _run_migrations)
-    logger.info("Migrations applied")
+    async def _run_migrations() -> None:
+        # Reuse the app's asyncpg engine. connect() rather than begin(): Alembic must own the
+        # transaction so autocommit_block() (CREATE INDEX CONCURRENTLY) can commit around it.
+        async with engine.connect() as conn:
+            await conn.run_sync(_upgrade)
+            await conn.commit()
 
-    await workspace_migrate.migrate_db_content_to_workspace()
+    loop = asyncio.get_event_loop()
 
-    await loop.run_in_executor(None, embeddings.load_model)
+    def _reindex_batch(rows: list) -> int:
+        # File reads + Redis/embedding work, off the event loop
+        payload = [
+            (user_id, note_id, title, workspace.get_content(user_id, note_id))
+            for user_id, note_id, title in rows
+        ]
+        return search_service.reindex_notes_sync(payload)
 
     async def _reindex_all() -> None:
+        # Server-side cursor: at most one batch of rows and contents in memory at a time
+        count = 0
         async with async_session_maker() as db:
-            result = await db.execute(
-                select(Note).where(Note.deleted_at.is_(None))
+            result = await db.stream(
+                select(Note.user_id, Note.id, Note.title)
+                .where(Note.deleted_at.is_(None))
+                .execution_options(yield_per=search_service.REINDEX_BATCH)
             )
-            notes = list(result.scalars().all())
-        if not notes:
-            return
-        payload = [
-            (n.user_id, n.id, n.title, workspace.get_content(n.user_id, n.id))
-            for n in notes
-        ]
-        count = await loop.run_in_executor(None, search_service.reindex_notes_sync, payload)
-        logger.info("Search reindex: %s notes", count)
-
-    await _reindex_all()
-
-    await loop.run_in_executor(None, stt.load_model)
-    unload_task = stt.start_idle_unload_task()
+            async for rows in result.partitions(search_service.REINDEX_BATCH):
+                count += await loop.run_in_executor(None, _reindex_batch, rows)
+                logger.info("Search reindex: %s notes so far", count)
+        if count:
+            logger.info("Search reindex: %s notes", count)
+
+    async def _prepare_db() -> None:
+        if settings.migration_mode != "skip":
+            await _run_migrations()
+            logger.info("Migrations applied")
+        await workspace_migrate.migrate_db_content_to_workspace()
+        app.state.migrations_done.set()
+
+    async def _startup() -> None:
+        # The embedding model load doesn't touch the DB: it runs in a thread while migrations run
+        # on the loop. The reindex needs both. Whisper loads lazily on the first transcription.
+        await asyncio.gather(
+            _prepare_db(),
+            loop.run_in_executor(None, embeddings.load_model),
+        )
+        await _reindex_all()
+
+    async def _startup_background() -> None:
+        try:
+            await _startup()
+        except Exception:
+            logger.exception("Background startup (migrations/reindex) failed")
+            # Before migrations_done: requests keep getting 503 and /health reports the failure
+            if not app.state.migrations_done.is_set():
+                app.state.startup_failed = True
+
+    background: list[asyncio.Task] = []
+    if settings.migration_mode == "async":
+        background.append(asyncio.create_task(_startup_background()))
+    else:
+        await _startup()
+
+    background.append(stt.start_idle_unload_task())
 
     yield
 
-    # Shutdown: cancel idle-unload task
-    unload_task.cancel()
-    try:
-        await unload_task
-    except asyncio.CancelledError:
-        pass
+    # Shutdown: cancel idle-unload (and a still-running background startup) task
+    for task in background:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
 
 
 app = FastAPI(title="AI Notes API", lifespan=lifespan)
 app.state.limiter = limiter
+# Set once the schema is current (immediately after startup unless MIGRATION_MODE=async)
+app.state.migrations_done = asyncio.Event()
+# Set when MIGRATION_MODE=async startup failed before the schema became current; needs a restart
+app.state.startup_failed = False
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 app.add_middleware(SlowAPIMiddleware)
 
 
+@app.middleware("http")
+async def wait_for_migrations(request: Request, call_next):
+    if not app.state.migrations_done.is_set() and request.url.path != "/health":
+        if app.state.startup_failed:
+            return JSONResponse(status_code=503, content={"detail": "Миграции БД не выполнены, сервис недоступен"})
+        return JSONResponse(status_code=503, content={"detail": "Идут миграции БД, повторите позже"})
+    return await call_next(request)
+
+
 @app.exception_handler(Exception)
 async def log_unhandled_exceptions(request: Request, exc: Exception) -> JSONResponse:
     logger.exception("Unhandled exception", extra={"path": request.url.path, "method": request.method})
@@ -114,5 +166,10 @@ app.include_router(websocket.router)
 
 
 @app.get("/health")
-async def health() -> dict:
+async def health(response: Response) -> dict:
+    if not app.state.migrations_done.is_set():
+        if app.state.startup_failed:
+            response.status_code = 503
+            return {"status": "error", "migrations": "failed"}
+        return {"status": "starting", "migrations": "running"}
     return {"status": "ok"}
@@ -2,9 +2,31 @@
 
 from slowapi import Limiter
 from slowapi.util import get_remote_address
+from starlette.requests import Request
 
-limiter = Limiter(key_func=get_remote_address)
+from app.config import settings
+from app.services.auth import decode_token
+
+
+def get_user_or_remote_address(request: Request) -> str:
+    """Authenticated user id from the bearer token, else client IP (users behind one NAT don't share a bucket)."""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            return f"user:{decode_token(token).user_id}"
+        except Exception:
+            pass
+    return get_remote_address(request)
+
+
+# Counters live in Redis so the limits hold across workers; moving window has no burst at window edges
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=settings.redis_url,
+    strategy="moving-window",
+    in_memory_fallback_enabled=True,
+)
 
 rate_limiter = limiter.limit("60/minute")
-transcribe_limiter = limiter.limit("10/minute")
+transcribe_limiter = limiter.limit("10/minute", key_func=get_user_or_remote_address)
 agent_limiter = limiter.limit("30/minute")
@@ -6,8 +6,9 @@ from app.models.note import Note
 from app.models.note_link import NoteLink
 from app.models.note_version import NoteVersion
 from app.models.saved_message import SavedMessage, SavedMessageCategory
+from app.models.subtask import Subtask
 from app.models.tag import NoteTag, Tag
 from app.models.user import User
 from app.models.user_profile_fact import UserProfileFact
 
-__all__ = ["User", "Folder", "Note", "Event", "UserProfileFact", "AgentSettings", "ChatSession", "ChatMessage", "Tag", "NoteTag", "NoteLink", "NoteVersion", "SavedMessage", "SavedMessageCategory"]
+__all__ = ["User", "Folder", "Note", "Event", "UserProfileFact", "AgentSettings", "ChatSession", "ChatMessage", "Tag", "NoteTag", "NoteLink", "NoteVersion", "SavedMessage", "SavedMessageCategory", "Subtask"]
@@ -1,29 +1,60 @@
-from datetime import datetime
+from datetime import datetime, timezone
+from typing import Any
 
-from sqlalchemy import Boolean, ForeignKey, String, Text
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import BigInteger, Boolean, DateTime, FetchedValue, ForeignKey, Index, String, Text, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
+from app.models.subtask import Subtask
 
 
 class Note(Base):
     __tablename__ = "notes"
+    __table_args__ = (
+        Index(
+            "ix_notes_user_active_updated",
+            "user_id",
+            text("updated_at DESC"),
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "ix_notes_user_task_deadline",
+            "user_id",
+            "deadline",
+            postgresql_where=text("is_task = true AND deleted_at IS NULL"),
+        ),
+        Index(
+            "ix_notes_pinned_user",
+            "user_id",
+            text("updated_at DESC"),
+            postgresql_where=text("pinned = true AND deleted_at IS NULL"),
+        ),
+        Index(
+            "ix_notes_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+    )
+    # Fetch server-generated created_at/updated_at via RETURNING instead of lazy-loading later
+    __mapper_args__ = {"eager_defaults": True}
 
-    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     folder_id: Mapped[int | None] = mapped_column(
         ForeignKey("folders.id", ondelete="SET NULL"), nullable=True
     )
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     content: Mapped[str] = mapped_column(Text, default="")
-    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
-    updated_at: Mapped[datetime] = mapped_column(default=datetime.utcnow, onupdate=datetime.utcnow)
-    deleted_at: Mapped[datetime | None] = mapped_column(default=None, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue()
+    )
+    deleted_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), default=None, nullable=True)
     is_task: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
-    subtasks: Mapped[list[dict] | None] = mapped_column(JSONB, default=None, nullable=True)
-    completed_at: Mapped[datetime | None] = mapped_column(default=None, nullable=True)
-    deadline: Mapped[datetime | None] = mapped_column(default=None, nullable=True)
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), default=None, nullable=True)
+    deadline: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), default=None, nullable=True)
     priority: Mapped[str | None] = mapped_column(String(16), default="medium", nullable=True)
     task_status: Mapped[str | None] = mapped_column(String(20), default="backlog", nullable=True)
     pinned: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
@@ -38,3 +69,36 @@ class Note(Base):
     outgoing_links = relationship("NoteLink", foreign_keys="NoteLink.source_note_id", back_populates="source_note", cascade="all, delete-orphan")
     incoming_links = relationship("NoteLink", foreign_keys="NoteLink.target_note_id", back_populates="target_note", cascade="all, delete-orphan")
     versions = relationship("NoteVersion", back_populates="note", cascade="all, delete-orphan")
+    subtask_items = relationship(
+        "Subtask",
+        back_populates="note",
+        order_by="Subtask.position",
+        cascade="all, delete-orphan",
+        lazy="selectin",
+    )
+
+    @property
+    def subtasks(self) -> list[dict[str, Any]] | None:
+        """Subtasks as [{text, done}], None when the task has none."""
+        return [{"text": s.text, "done": s.done} for s in self.subtask_items] or None
+
+    @subtasks.setter
+    def subtasks(self, items: list[dict[str, Any]] | None) -> None:
+        """Sync subtask rows in place: toggling one checkbox updates only that row."""
+        items = items or []
+        existing = self.subtask_items
+        now = datetime.now(timezone.utc)
+        for position, item in enumerate(items):
+            text_value = str(item.get("text", ""))
+            done = bool(item.get("done", False))
+            if position < len(existing):
+                st = existing[position]
+                st.text = text_value
+                if st.done != done:
+                    st.done = done
+                    st.completed_at = now if done else None
+            else:
+                existing.append(
+                    Subtask(position=position, text=text_value, done=done, completed_at=now if done else None)
+                )
+        del existing[len(items):]
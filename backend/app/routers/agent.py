@@ -9,10 +9,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from fastapi import status
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 
 from app.database import get_db
-from app.dependencies import get_current_user
-from app.models import User, UserProfileFact
+from app.dependencies import CurrentUser, get_current_user
+from app.models import UserProfileFact
 from app.schemas.agent import (
     AgentProcessRequest,
     AgentProcessResponse,
@@ -29,7 +30,12 @@ from app.middleware.rate_limit import agent_limiter
 from app.agent.intent_classifier import IntentClassifier, IntentCategory
 from app.agent.tools.request_clarification import ClarificationNeeded
 from app.services.agent import get_profile_facts, _is_redundant_profile_fact
-from app.services.agent_settings_service import get_agent_settings, get_agent_settings_for_api, upsert_agent_settings
+from app.services.agent_settings_service import (
+    get_agent_settings,
+    get_agent_settings_for_api,
+    invalidate_agent_settings,
+    upsert_agent_settings,
+)
 from app.services.llm import test_connection
 from app.services.pending_actions import pending_actions, PendingAction
 
@@ -47,7 +53,7 @@ _dispatcher = AgentDispatcher()
 
 async def _stream_generator(
     db: AsyncSession,
-    user: User,
+    user: CurrentUser,
     user_input: str,
     note_id: int | None,
     session_id: str | None = None,
@@ -159,7 +165,7 @@ async def _stream_generator(
 async def get_settings(
     agent: str = "notes",
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> AgentSettingsResponse:
     if agent not in ("notes", "chat"):
         raise HTTPException(status_code=400, detail="agent must be 'notes' or 'chat'")
@@ -172,7 +178,7 @@ async def patch_settings(
     data: AgentSettingsUpdate,
     agent: str = "notes",
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> AgentSettingsResponse:
     if agent not in ("notes", "chat"):
         raise HTTPException(status_code=400, detail="agent must be 'notes' or 'chat'")
@@ -189,6 +195,8 @@ async def patch_settings(
         max_tokens=data.max_tokens,
     )
     await db.commit()
+    # A concurrent read between upsert and commit may have cached the old row
+    invalidate_agent_settings(user.id, agent)
     s = await get_agent_settings_for_api(db, user.id, agent)
     return AgentSettingsResponse(**s)
 
@@ -198,7 +206,7 @@ async def test_settings(
     data: AgentSettingsTestRequest,
     agent: str = "notes",
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> AgentSettingsTestResponse:
     if agent not in ("notes", "chat"):
         raise HTTPException(status_code=400, detail="agent must be 'notes' or 'chat'")
@@ -229,7 +237,7 @@ async def test_settings(
 async def create_profile_fact(
     data: ProfileFactUpdate,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> ProfileFactItem:
     fact_text = data.fact.strip()
     if not fact_text:
@@ -248,7 +256,12 @@ async def create_profile_fact(
         )
     row = UserProfileFact(user_id=user.id, fact=fact_text)
     db.add(row)
-    await db.commit()
+    try:
+        await db.commit()
+    except IntegrityError:
+        # uq_upf_user_normfact: a concurrent insert, or lower(btrim()) folding what strip().lower() kept
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Такой факт уже есть")
     await db.refresh(row)
     return ProfileFactItem(id=row.id, fact=row.fact)
 
@@ -256,7 +269,7 @@ async def create_profile_fact(
 @router.get("/profile", response_model=ProfileFactsResponse)
 async def get_profile(
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> ProfileFactsResponse:
     rows = await get_profile_facts(db, user.id)
     facts = [ProfileFactItem(id=fid, fact=f) for fid, f in rows]
@@ -268,7 +281,7 @@ async def update_profile_fact(
     fact_id: int,
     data: ProfileFactUpdate,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> ProfileFactItem:
     result = await db.execute(
         select(UserProfileFact).where(
@@ -283,7 +296,11 @@ async def update_profile_fact(
     if not fact_text:
         raise HTTPException(status_code=400, detail="Fact cannot be empty")
     row.fact = fact_text
-    await db.commit()
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Такой факт уже есть")
     await db.refresh(row)
     return ProfileFactItem(id=row.id, fact=row.fact)
 
@@ -292,7 +309,7 @@ async def update_profile_fact(
 async def delete_profile_fact(
     fact_id: int,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> None:
     result = await db.execute(
         select(UserProfileFact).where(
@@ -313,7 +330,7 @@ async def agent_process(
     request: Request,
     data: AgentProcessRequest,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> AgentProcessResponse:
     intent = await IntentClassifier.classify_intent(db, user.id, data.user_input)
     if intent == IntentCategory.UNKNOWN:
@@ -352,7 +369,7 @@ async def agent_process_stream(
     request: Request,
     data: AgentProcessRequest,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ):
     return StreamingResponse(
         _stream_generator(db, user, data.user_input, data.note_id),
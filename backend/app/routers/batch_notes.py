@@ -5,8 +5,8 @@ from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.dependencies import get_current_user
-from app.models import Folder, Note, User
+from app.dependencies import CurrentUser, get_current_user
+from app.models import Folder, Note
 from app.schemas.note import BatchDeleteRequest, BatchMoveRequest
 from app.services import search, workspace
 
@@ -27,7 +27,7 @@ async def _get_note_for_user(
 async def batch_move_notes(
     body: BatchMoveRequest,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> None:
     target_folder_id = body.target_folder_id
     for note_id in body.note_ids:
@@ -52,7 +52,7 @@ async def batch_move_notes(
 async def batch_delete_notes(
     body: BatchDeleteRequest,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> None:
     for note_id in body.note_ids:
         note = await _get_note_for_user(db, note_id, user.id)
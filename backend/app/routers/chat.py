@@ -7,8 +7,8 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.dependencies import get_current_user
-from app.models import ChatMessage, ChatSession, User
+from app.dependencies import CurrentUser, get_current_user
+from app.models import ChatMessage, ChatSession
 from app.schemas.chat import ChatMessageRequest, ChatSessionPatch, RegenerateRequest
 from app.services.chat_agent import stream_chat_response, stream_chat_response_regenerate
 
@@ -24,7 +24,7 @@ def _sse_event(event: str, data: dict) -> bytes:
 @router.get("/sessions")
 async def list_sessions(
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ):
     """List chat sessions for user."""
     result = await db.execute(
@@ -39,7 +39,7 @@ async def list_sessions(
 @router.post("/sessions")
 async def create_session(
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ):
     """Create a new chat session."""
     session = ChatSession(user_id=user.id, title="Новый диалог")
@@ -53,7 +53,7 @@ async def create_session(
 async def get_session(
     session_id: int,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ):
     """Get session with messages."""
     result = await db.execute(
@@ -64,7 +64,7 @@ async def get_session(
         raise HTTPException(status_code=404, detail="Session not found")
 
     msg_result = await db.execute(
-        select(ChatMessage).where(ChatMessage.session_id == session_id).order_by(ChatMessage.created_at)
+        select(ChatMessage).where(ChatMessage.session_id == session_id).order_by(ChatMessage.id)
     )
     messages = list(msg_result.scalars().all())
 
@@ -91,7 +91,7 @@ async def patch_session(
     session_id: int,
     data: ChatSessionPatch,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ):
     """Update session (e.g. title)."""
     result = await db.execute(
@@ -111,7 +111,7 @@ async def patch_session(
 async def delete_session(
     session_id: int,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ):
     """Delete a chat session."""
     result = await db.execute(
@@ -130,7 +130,7 @@ async def delete_message(
     session_id: int,
     message_id: int,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ):
     """Delete a message from a session."""
     result = await db.execute(
@@ -158,7 +158,7 @@ async def regenerate_message(
     session_id: int,
     data: RegenerateRequest,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ):
     """Regenerate assistant response for the given message."""
     async def gen():
@@ -203,7 +203,7 @@ async def send_message(
     session_id: int,
     data: ChatMessageRequest,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ):
     """Send message and stream response."""
     content = (data.content or "").strip()
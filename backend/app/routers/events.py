@@ -5,8 +5,8 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.dependencies import get_current_user
-from app.models import Event, User
+from app.dependencies import CurrentUser, get_current_user
+from app.models import Event
 from app.schemas.event import EventResponse
 
 router = APIRouter(prefix="/events", tags=["events"])
@@ -17,7 +17,7 @@ async def list_events(
     from_dt: datetime = Query(..., alias="from", description="ISO 8601 start of range"),
     to_dt: datetime = Query(..., alias="to", description="ISO 8601 end of range"),
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> list[EventResponse]:
     result = await db.execute(
         select(Event)
@@ -11,8 +11,8 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.dependencies import get_current_user
-from app.models import Folder, Note, User
+from app.dependencies import CurrentUser, get_current_user
+from app.models import Folder, Note
 from app.services import workspace
 
 router = APIRouter(prefix="/export", tags=["export"])
@@ -41,7 +41,7 @@ async def _get_folder_paths(db: AsyncSession, user_id: int) -> dict[int | None,
 @router.get("/obsidian")
 async def export_obsidian_vault(
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ):
     """Export all notes as Obsidian-compatible zip: folders as dirs, notes as .md files."""
     path_by_folder = await _get_folder_paths(db, user.id)
@@ -4,8 +4,8 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
-from app.dependencies import get_current_user
-from app.models import Folder, Note, User
+from app.dependencies import CurrentUser, get_current_user
+from app.models import Folder, Note
 from app.schemas.folder import FolderCreate, FolderResponse, FolderTree, FolderTreeResponse, FolderUpdate, NoteRef
 
 router = APIRouter(prefix="/folders", tags=["folders"])
@@ -25,7 +25,7 @@ async def _get_folder_for_user(
 @router.get("", response_model=FolderTreeResponse)
 async def get_folder_tree(
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> FolderTreeResponse:
     result = await db.execute(
         select(Folder)
@@ -35,10 +35,11 @@ async def get_folder_tree(
     folders = list(result.scalars().all())
 
     notes_result = await db.execute(
-        select(Note)
+        select(Note.id, Note.folder_id, Note.title, Note.pinned, Note.updated_at)
         .where(Note.user_id == user.id, Note.deleted_at.is_(None))
+        .order_by(Note.updated_at.desc())
     )
-    notes = notes_result.scalars().all()
+    notes = notes_result.all()
 
     folder_map: dict[int, FolderTree] = {}
     for f in folders:
@@ -77,7 +78,7 @@ async def get_folder_tree(
 async def create_folder(
     data: FolderCreate,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> Folder:
     if data.parent_folder_id is not None:
         parent = await _get_folder_for_user(
@@ -119,7 +120,7 @@ async def update_folder(
     folder_id: int,
     data: FolderUpdate,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> Folder:
     folder = await _get_folder_for_user(db, folder_id, user.id)
     if folder is None:
@@ -159,7 +160,7 @@ async def update_folder(
 async def delete_folder(
     folder_id: int,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> None:
     folder = await _get_folder_for_user(db, folder_id, user.id)
     if folder is None:
@@ -6,8 +6,8 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.dependencies import get_current_user
-from app.models import Folder, Note, NoteTag, Tag, User
+from app.dependencies import CurrentUser, get_current_user
+from app.models import Folder, Note, NoteTag, Tag
 from app.schemas.note import NoteCreate, NoteResponse, NoteUpdate, TrashItem
 from app.services import search, workspace
 from app.services.note_links import get_backlinks, get_graph_data, get_related_notes, update_note_links
@@ -40,7 +40,7 @@ DAILY_NOTE_PREFIX = "Daily "
 @router.get("/daily", response_model=NoteResponse)
 async def get_or_create_daily_note(
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> NoteResponse:
     """Get or create today's daily note. Title format: Daily YYYY-MM-DD."""
     from datetime import date
@@ -109,7 +109,7 @@ async def get_or_create_daily_note(
 @router.get("/graph")
 async def get_graph(
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ):
     """Get nodes and edges for force-directed graph of note links."""
     return await get_graph_data(db, user.id)
@@ -119,7 +119,7 @@ async def get_graph(
 async def summarize_note(
     note_id: int,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> NoteResponse:
     """Summarize note content and prepend as callout block."""
     note = await _get_note_for_user(db, note_id, user.id)
@@ -163,7 +163,7 @@ async def summarize_note(
 
     new_content = f"{summary}\n\n---\n\n{content}"
     workspace.set_content(user.id, note.id, new_content)
-    note.updated_at = datetime.now(timezone.utc).replace(tzinfo=None)
+    note.updated_at = datetime.now(timezone.utc)
     await db.commit()
     await db.refresh(note)
     search.index_note(user.id, note.id, note.title, new_content)
@@ -188,7 +188,7 @@ async def summarize_note(
 @router.get("/trash", response_model=list[TrashItem])
 async def list_trash(
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> list[TrashItem]:
     result = await db.execute(
         select(Note)
@@ -206,7 +206,7 @@ async def list_trash(
 async def restore_note(
     note_id: int,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> None:
     note = await _get_note_for_user(db, note_id, user.id, include_deleted=True)
     if note is None:
@@ -223,7 +223,7 @@ async def restore_note(
 async def permanent_delete_note(
     note_id: int,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> None:
     note = await _get_note_for_user(db, note_id, user.id, include_deleted=True)
     if note is None:
@@ -238,7 +238,7 @@ async def permanent_delete_note(
 async def get_note(
     note_id: int,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> NoteResponse:
     note = await _get_note_for_user(db, note_id, user.id)
     if note is None:
@@ -266,7 +266,7 @@ async def get_note(
 async def create_note(
     data: NoteCreate,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> NoteResponse:
     if data.folder_id is not None:
         result = await db.execute(
@@ -318,7 +318,7 @@ async def update_note(
     note_id: int,
     data: NoteUpdate,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> NoteResponse:
     note = await _get_note_for_user(db, note_id, user.id)
     if note is None:
@@ -330,7 +330,7 @@ async def update_note(
     if data.content is not None:
         old_content = workspace.get_content(user.id, note.id)
         workspace.set_content(user.id, note.id, data.content)
-        note.updated_at = datetime.now(timezone.utc).replace(tzinfo=None)
+        note.updated_at = datetime.now(timezone.utc)
         await create_version(db, user.id, note.id, old_content, data.content)
         await update_note_links(db, user.id, note.id, data.content)
     if data.folder_id is not None:
@@ -381,7 +381,7 @@ async def update_note(
 async def duplicate_note(
     note_id: int,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> NoteResponse:
     note = await _get_note_for_user(db, note_id, user.id)
     if note is None:
@@ -432,13 +432,13 @@ async def duplicate_note(
 async def delete_note(
     note_id: int,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> None:
     note = await _get_note_for_user(db, note_id, user.id)
     if note is None:
         raise HTTPException(status_code=404, detail="Note not found")
     search.delete_note(user.id, note.id)
-    note.deleted_at = datetime.now(timezone.utc).replace(tzinfo=None)
+    note.deleted_at = datetime.now(timezone.utc)
     await db.commit()
 
 
@@ -446,7 +446,7 @@ async def delete_note(
 async def list_backlinks(
     note_id: int,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ):
     note = await _get_note_for_user(db, note_id, user.id)
     if note is None:
@@ -459,7 +459,7 @@ async def list_related(
     note_id: int,
     limit: int = 5,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ):
     note = await _get_note_for_user(db, note_id, user.id)
     if note is None:
@@ -472,7 +472,7 @@ async def list_versions(
     note_id: int,
     limit: int = 20,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ):
     note = await _get_note_for_user(db, note_id, user.id)
     if note is None:
@@ -485,7 +485,7 @@ async def restore_note_version(
     note_id: int,
     version: int,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ):
     note = await _get_note_for_user(db, note_id, user.id)
     if note is None:
@@ -4,8 +4,8 @@ from sqlalchemy import select, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.dependencies import get_current_user
-from app.models import SavedMessage, SavedMessageCategory, User
+from app.dependencies import CurrentUser, get_current_user
+from app.models import SavedMessage, SavedMessageCategory
 from app.schemas.saved_message import (
     SavedMessageCreate,
     SavedMessageResponse,
@@ -24,7 +24,7 @@ router = APIRouter(prefix="/saved-messages", tags=["saved-messages"])
 @router.get("/categories", response_model=list[SavedMessageCategoryResponse])
 async def list_categories(
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> list[SavedMessageCategoryResponse]:
     result = await db.execute(
         select(SavedMessageCategory).where(SavedMessageCategory.user_id == user.id).order_by(SavedMessageCategory.name)
@@ -37,7 +37,7 @@ async def list_categories(
 async def create_category(
     data: SavedMessageCategoryCreate,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> SavedMessageCategoryResponse:
     existing = await db.execute(
         select(SavedMessageCategory).where(
@@ -59,7 +59,7 @@ async def create_category(
 async def delete_category(
     category_id: int,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> None:
     result = await db.execute(
         select(SavedMessageCategory).where(
@@ -85,7 +85,7 @@ async def delete_category(
 async def list_messages(
     category_id: int | None = None,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> list[SavedMessageResponse]:
     query = select(SavedMessage).where(
         SavedMessage.user_id == user.id,
@@ -116,7 +116,7 @@ async def create_message(
     data: SavedMessageCreate,
     auto_categorize: bool = True,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> SavedMessageResponse:
     category = None
 
@@ -148,7 +148,7 @@ async def create_message(
 async def delete_message(
     message_id: int,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> None:
     result = await db.execute(
         select(SavedMessage).where(
@@ -161,7 +161,7 @@ async def delete_message(
     if message is None:
         raise HTTPException(status_code=404, detail="Message not found")
 
-    message.deleted_at = datetime.now(timezone.utc).replace(tzinfo=None)
+    message.deleted_at = datetime.now(timezone.utc)
     await db.commit()
 
 
@@ -170,7 +170,7 @@ async def delete_message(
 @router.get("/trash", response_model=list[SavedMessageTrashItem])
 async def list_trash(
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> list[SavedMessageTrashItem]:
     result = await db.execute(
         select(SavedMessage)
@@ -193,7 +193,7 @@ async def list_trash(
 async def restore_message(
     message_id: int,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> None:
     result = await db.execute(
         select(SavedMessage).where(
@@ -216,7 +216,7 @@ async def restore_message(
 async def permanent_delete_message(
     message_id: int,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> None:
     result = await db.execute(
         select(SavedMessage).where(
@@ -241,7 +241,7 @@ async def search_messages(
     category_id: int | None = None,
     limit: int = 20,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> list[SavedMessageResponse]:
     if not q or len(q.strip()) < 1:
         return []
@@ -3,8 +3,8 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
-from app.dependencies import get_current_user
-from app.models import Note, NoteTag, User
+from app.dependencies import CurrentUser, get_current_user
+from app.models import Note, NoteTag
 from app.services import search, workspace
 
 router = APIRouter(prefix="/search", tags=["search"])
@@ -18,7 +18,7 @@ async def search_notes_endpoint(
     tag_id: int | None = Query(None, description="Filter by tag"),
     type_filter: str | None = Query(None, alias="type", description="'note' or 'task'"),
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ):
     """Hybrid search over notes. Returns [{id, title, folder_id, snippet}]. Optional filters: folder_id, tag_id, type."""
     try:
@@ -72,7 +72,7 @@ async def search_notes_endpoint(
 @router.post("/reindex")
 async def reindex(
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ):
     """Reindex all notes for the current user."""
     result = await db.execute(
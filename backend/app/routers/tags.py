@@ -3,8 +3,8 @@ from sqlalchemy import select, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.dependencies import get_current_user
-from app.models import Note, NoteTag, Tag, User
+from app.dependencies import CurrentUser, get_current_user
+from app.models import Note, NoteTag, Tag
 from app.schemas.tag import TagCreate, TagResponse, TagUpdate, NoteTagsUpdate
 
 router = APIRouter(prefix="/tags", tags=["tags"])
@@ -13,7 +13,7 @@ router = APIRouter(prefix="/tags", tags=["tags"])
 @router.get("", response_model=list[TagResponse])
 async def list_tags(
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> list[TagResponse]:
     result = await db.execute(
         select(Tag).where(Tag.user_id == user.id).order_by(Tag.name)
@@ -26,7 +26,7 @@ async def list_tags(
 async def create_tag(
     data: TagCreate,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> TagResponse:
     existing = await db.execute(
         select(Tag).where(Tag.user_id == user.id, Tag.name == data.name)
@@ -46,7 +46,7 @@ async def update_tag(
     tag_id: int,
     data: TagUpdate,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> TagResponse:
     result = await db.execute(
         select(Tag).where(Tag.id == tag_id, Tag.user_id == user.id)
@@ -79,7 +79,7 @@ async def update_tag(
 async def list_notes_by_tag(
     tag_id: int,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> list[int]:
     """Return note IDs that have this tag."""
     result = await db.execute(
@@ -96,7 +96,7 @@ async def list_notes_by_tag(
 async def delete_tag(
     tag_id: int,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> None:
     result = await db.execute(
         select(Tag).where(Tag.id == tag_id, Tag.user_id == user.id)
@@ -112,7 +112,7 @@ async def delete_tag(
 async def get_note_tags(
     note_id: int,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> list[TagResponse]:
     note_result = await db.execute(
         select(Note).where(Note.id == note_id, Note.user_id == user.id)
@@ -135,7 +135,7 @@ async def set_note_tags(
     note_id: int,
     data: NoteTagsUpdate,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> list[TagResponse]:
     note_result = await db.execute(
         select(Note).where(Note.id == note_id, Note.user_id == user.id)
@@ -176,7 +176,7 @@ async def add_tag_to_note(
     note_id: int,
     tag_id: int,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> list[TagResponse]:
     note_result = await db.execute(
         select(Note).where(Note.id == note_id, Note.user_id == user.id)
@@ -212,7 +212,7 @@ async def remove_tag_from_note(
     note_id: int,
     tag_id: int,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> None:
     note_result = await db.execute(
         select(Note).where(Note.id == note_id, Note.user_id == user.id)
@@ -7,8 +7,8 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.dependencies import get_current_user
-from app.models import Folder, Note, User
+from app.dependencies import CurrentUser, get_current_user
+from app.models import Folder, Note
 from app.schemas.note import TaskCategory, TaskResponse
 from app.services.agent import TASKS_FOLDER_NAME
 from app.services import workspace
@@ -57,7 +57,7 @@ def _build_task_response(note: Note, content: str) -> TaskResponse:
 @router.get("/categories", response_model=list[TaskCategory])
 async def list_task_categories(
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> list[TaskCategory]:
     tasks_folder = await _get_tasks_folder(db, user.id)
     if tasks_folder is None:
@@ -79,7 +79,7 @@ async def list_tasks(
     overdue: bool = False,
     priority: Literal["high", "medium", "low"] | None = None,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> list[TaskResponse]:
     tasks_folder = await _get_tasks_folder(db, user.id)
     if tasks_folder is None:
@@ -121,7 +121,7 @@ async def list_tasks(
 async def complete_task(
     task_id: int,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> TaskResponse:
     result = await db.execute(
         select(Note).where(
@@ -134,7 +134,7 @@ async def complete_task(
     note = result.scalar_one_or_none()
     if note is None:
         raise HTTPException(status_code=404, detail="Task not found")
-    note.completed_at = datetime.now(timezone.utc).replace(tzinfo=None)
+    note.completed_at = datetime.now(timezone.utc)
     note.task_status = "done"
     await db.commit()
     await db.refresh(note)
@@ -146,7 +146,7 @@ async def complete_task(
 async def uncomplete_task(
     task_id: int,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> TaskResponse:
     result = await db.execute(
         select(Note).where(
@@ -172,7 +172,7 @@ async def update_subtasks(
     task_id: int,
     data: SubtaskUpdate,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> TaskResponse:
     result = await db.execute(
         select(Note).where(
@@ -186,7 +186,6 @@ async def update_subtasks(
     if note is None:
         raise HTTPException(status_code=404, detail="Task not found")
     note.subtasks = data.subtasks
-    note.updated_at = datetime.now(timezone.utc).replace(tzinfo=None)
     await db.commit()
     await db.refresh(note)
     content = workspace.get_content(user.id, note.id)
@@ -198,7 +197,7 @@ async def update_task(
     task_id: int,
     data: TaskUpdate,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> TaskResponse:
     result = await db.execute(
         select(Note).where(
@@ -218,10 +217,10 @@ async def update_task(
     if data.task_status is not None:
         note.task_status = data.task_status
         if data.task_status == "done":
-            note.completed_at = note.completed_at or datetime.now(timezone.utc).replace(tzinfo=None)
+            note.completed_at = note.completed_at or datetime.now(timezone.utc)
         elif data.task_status != "done":
             note.completed_at = None
-    note.updated_at = datetime.now(timezone.utc).replace(tzinfo=None)
+    note.updated_at = datetime.now(timezone.utc)
     await db.commit()
     await db.refresh(note)
     content = workspace.get_content(user.id, note.id)
@@ -8,7 +8,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.dependencies import get_current_user
+from app.dependencies import CurrentUser, get_current_user
 from app.models import User, UserProfileFact
 from app.services import agent
 
@@ -20,7 +20,7 @@ router = APIRouter(prefix="/telegram", tags=["telegram"])
 @router.get("/webhook/info")
 async def get_webhook_info(
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> dict[str, Any]:
     result = await db.execute(
         select(User).where(User.email.contains("@telegram"), User.email.endswith(".bot"))
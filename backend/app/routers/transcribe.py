@@ -2,8 +2,7 @@ import logging
 
 from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Request
 
-from app.dependencies import get_current_user
-from app.models import User
+from app.dependencies import CurrentUser, get_current_user
 from app.middleware.rate_limit import transcribe_limiter
 from app.services.stt import transcribe
 
@@ -17,7 +16,7 @@ router = APIRouter(prefix="/transcribe", tags=["transcribe"])
 async def transcribe_audio(
     request: Request,
     file: UploadFile = File(...),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> dict[str, str]:
     if not file.content_type or "audio" not in file.content_type:
         raise HTTPException(status_code=400, detail="Expected audio file")
@@ -61,7 +61,7 @@ async def handle_agent_message(
 ):
     """Process agent input via WebSocket."""
     from app.agent.dispatcher import AgentDispatcher
-    from app.agent.intent_classifier import IntentClassifier
+    from app.agent.intent_classifier import IntentCategory, intent_from_value
     from app.agent.tools.request_clarification import ClarificationNeeded
 
     action = message.get("action")
@@ -80,7 +80,7 @@ async def handle_agent_message(
 
         try:
             affected, created, _ = await AgentDispatcher().process(
-                intent=IntentClassifier.INTENT_LABEL_MAP.get(intent, IntentClassifier.IntentCategory.NOTE),
+                intent=intent_from_value(intent, IntentCategory.NOTE),
                 db=db,
                 user_id=user_id,
                 user_input=user_input,
@@ -109,6 +109,10 @@ async def handle_agent_message(
 
 @router.websocket("/agent")
 async def websocket_agent(websocket: WebSocket):
+    # Same gate as the HTTP wait_for_migrations middleware, which websockets bypass
+    if not websocket.app.state.migrations_done.is_set():
+        await websocket.close(code=1013)  # Try Again Later
+        return
     token = websocket.query_params.get("token")
     if not token:
         await websocket.close(code=4001)
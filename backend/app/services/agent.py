@@ -8,6 +8,7 @@ from datetime import datetime, timezone
 from typing import Any, Awaitable
 
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import Event, Folder, Note, User, UserProfileFact
@@ -697,7 +698,7 @@ async def process_agent(
             new_content = (cur or "") + f"\n\n--- {_ts()} ---\n\n" + content
             workspace.set_content(user.id, note.id, new_content)
             search.index_note(user.id, note.id, note.title, new_content)
-            note.updated_at = datetime.now(timezone.utc).replace(tzinfo=None)
+            note.updated_at = datetime.now(timezone.utc)
             affected_ids.append(note.id)
 
         elif name == "patch_note":
@@ -714,7 +715,7 @@ async def process_agent(
             new_content = _execute_patch_note(cur, old_text, new_text)
             workspace.set_content(user.id, note.id, new_content)
             search.index_note(user.id, note.id, note.title, new_content)
-            note.updated_at = datetime.now(timezone.utc).replace(tzinfo=None)
+            note.updated_at = datetime.now(timezone.utc)
             affected_ids.append(note.id)
 
         elif name == "create_folder":
@@ -800,8 +801,8 @@ async def process_agent(
                     )
                     continue
             try:
-                starts_dt = datetime.fromisoformat(starts_str.replace("Z", "+00:00"))
-                ends_dt = datetime.fromisoformat(ends_str.replace("Z", "+00:00"))
+                starts_dt = datetime.fromisoformat(starts_str)
+                ends_dt = datetime.fromisoformat(ends_str)
             except (ValueError, TypeError) as e:
                 logger.error(
                     "Agent create_note_with_event: invalid datetime",
@@ -847,8 +848,15 @@ async def process_agent(
                 if fact_normalized not in existing_set and not _is_redundant_profile_fact(
                     fact, existing_facts
                 ):
-                    db.add(UserProfileFact(user_id=user.id, fact=fact))
-                    await db.flush()
+                    try:
+                        # Savepoint: a uq_upf_user_normfact conflict must not abort the turn's other writes
+                        async with db.begin_nested():
+                            db.add(UserProfileFact(user_id=user.id, fact=fact))
+                    except IntegrityError:
+                        logger.debug(
+                            "update_user_profile: skipped duplicate",
+                            extra={"fact_preview": fact[:50]},
+                        )
                 else:
                     logger.debug(
                         "update_user_profile: skipped duplicate/redundant",
@@ -1,11 +1,24 @@
 """Get/update agent settings from DB. Uses config defaults when not set."""
 
+import time
+
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
 from app.models import AgentSettings
 
+# (user_id, agent_type) -> (expires_at, settings). Read on every agent turn, changed rarely;
+# per-process, so other workers may serve old values for up to _CACHE_TTL_SEC after an update.
+_CACHE_TTL_SEC = 60.0
+_CACHE_MAX = 10_000
+_cache: dict[tuple[int, str], tuple[float, dict]] = {}
+
+
+def invalidate_agent_settings(user_id: int, agent_type: str) -> None:
+    _cache.pop((user_id, agent_type), None)
+
+
 def _defaults_for_agent(agent_type: str) -> dict:
     if agent_type == "notes":
         return {
@@ -23,7 +36,22 @@ def _defaults_for_agent(agent_type: str) -> dict:
 async def get_agent_settings(
     db: AsyncSession, user_id: int, agent_type: str
 ) -> dict[str, float | int | str | list[str]]:
-    """Return settings for user+agent_type. Uses config defaults when not in DB."""
+    """Return settings for user+agent_type. Uses config defaults when not in DB. Cached for _CACHE_TTL_SEC."""
+    key = (user_id, agent_type)
+    now = time.monotonic()
+    hit = _cache.get(key)
+    if hit is not None and hit[0] > now:
+        return dict(hit[1])
+    value = await _load_agent_settings(db, user_id, agent_type)
+    if len(_cache) >= _CACHE_MAX:
+        _cache.pop(next(iter(_cache)))
+    _cache[key] = (now + _CACHE_TTL_SEC, value)
+    return dict(value)
+
+
+async def _load_agent_settings(
+    db: AsyncSession, user_id: int, agent_type: str
+) -> dict[str, float | int | str | list[str]]:
     defaults = _defaults_for_agent(agent_type)
     result = await db.execute(
         select(AgentSettings)
@@ -87,6 +115,7 @@ async def upsert_agent_settings(
     max_tokens: int | None = None,
 ) -> AgentSettings:
     """Create or update settings. Returns the row."""
+    invalidate_agent_settings(user_id, agent_type)
     defaults = _defaults_for_agent(agent_type)
     result = await db.execute(
         select(AgentSettings)
@@ -10,7 +10,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.agent import ChatExecutor
 from app.agent.base_executor import build_system_prompt
-from app.models import ChatMessage, ChatSession, User
+from app.dependencies import CurrentUser
+from app.models import ChatMessage, ChatSession
 from app.services.agent_settings_service import get_agent_settings
 
 logger = logging.getLogger(__name__)
@@ -41,7 +42,7 @@ def _build_messages_from_history(
 
 async def stream_chat_response(
     db: AsyncSession,
-    user: User,
+    user: CurrentUser,
     session_id: int,
     user_content: str,
 ) -> AsyncGenerator[dict[str, Any], None]:
@@ -59,14 +60,13 @@ async def stream_chat_response(
         yield {"type": "error", "message": "Session not found"}
         return
 
-    session.updated_at = datetime.now(timezone.utc).replace(tzinfo=None)
     user_msg = ChatMessage(session_id=session_id, role="user", content=user_content)
     db.add(user_msg)
     await db.commit()
     await db.refresh(user_msg)
 
     msg_result = await db.execute(
-        select(ChatMessage).where(ChatMessage.session_id == session_id).order_by(ChatMessage.created_at)
+        select(ChatMessage).where(ChatMessage.session_id == session_id).order_by(ChatMessage.id)
     )
     all_messages = list(msg_result.scalars().all())
     history = all_messages[:-1] if all_messages and all_messages[-1].id == user_msg.id else all_messages
@@ -105,7 +105,6 @@ async def stream_chat_response(
             break
         yield event
 
-    session.updated_at = datetime.now(timezone.utc).replace(tzinfo=None)
     if (session.title or "Новый диалог") == "Новый диалог" and user_content:
         session.title = (user_content.strip()[:50] + ("…" if len(user_content) > 50 else "")) or "Новый диалог"
     assistant_msg = ChatMessage(
@@ -131,7 +130,7 @@ async def stream_chat_response(
 
 async def stream_chat_response_regenerate(
     db: AsyncSession,
-    user: User,
+    user: CurrentUser,
     session_id: int,
     assistant_message_id: int,
 ) -> AsyncGenerator[dict[str, Any], None]:
@@ -146,7 +145,7 @@ async def stream_chat_response_regenerate(
         return
 
     msg_result = await db.execute(
-        select(ChatMessage).where(ChatMessage.session_id == session_id).order_by(ChatMessage.created_at)
+        select(ChatMessage).where(ChatMessage.session_id == session_id).order_by(ChatMessage.id)
     )
     all_msgs = list(msg_result.scalars().all())
     target_idx = next(
@@ -166,7 +165,6 @@ async def stream_chat_response_regenerate(
         await db.delete(m)
     await db.commit()
 
-    session.updated_at = datetime.now(timezone.utc).replace(tzinfo=None)
     history = all_msgs[:target_idx]
     agent_params = await get_agent_settings(db, user.id, "chat")
     history_openai = _build_messages_from_history(history, prev_user.content or "")
@@ -198,7 +196,6 @@ async def stream_chat_response_regenerate(
             break
         yield event
 
-    session.updated_at = datetime.now(timezone.utc).replace(tzinfo=None)
     assistant_msg = ChatMessage(
         session_id=session_id,
         role="assistant",
@@ -49,3 +49,14 @@ def embed(text: str) -> list[float]:
     model = get_model()
     vec = model.encode(text, device="cpu", convert_to_numpy=True)
     return vec.tolist()
+
+
+def embed_many(texts: list[str]) -> list[list[float]]:
+    """Batched embed(): one encode() call for all non-blank texts, order preserved."""
+    out: list[list[float]] = [[0.0] * EMBEDDING_DIMS for _ in texts]
+    idx = [i for i, t in enumerate(texts) if t and t.strip()]
+    if idx:
+        vecs = get_model().encode([texts[i] for i in idx], device="cpu", convert_to_numpy=True)
+        for i, vec in zip(idx, vecs):
+            out[i] = vec.tolist()
+    return out
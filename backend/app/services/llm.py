@@ -1,7 +1,7 @@
 import json
 import logging
-from collections.abc import AsyncGenerator
-from typing import Any
+from collections.abc import AsyncGenerator, Sequence
+from typing import Any, Literal
 
 import httpx
 
@@ -10,6 +10,38 @@ from app.config import settings
 logger = logging.getLogger(__name__)
 
 
+# id(tools) -> (tools, JSON bytes). Executors pass module-level tool tuples, so each is serialized once
+_TOOLS_JSON_MAX = 64
+_tools_json: dict[int, tuple[tuple, bytes]] = {}
+
+
+def _tools_json_bytes(tools: Sequence[dict[str, Any]]) -> bytes:
+    if not isinstance(tools, tuple):
+        return json.dumps(list(tools), ensure_ascii=False).encode()
+    hit = _tools_json.get(id(tools))
+    if hit is None or hit[0] is not tools:
+        if len(_tools_json) >= _TOOLS_JSON_MAX:
+            _tools_json.clear()
+        hit = (tools, json.dumps(tools, ensure_ascii=False).encode())
+        _tools_json[id(tools)] = hit
+    return hit[1]
+
+
+def _encode_body(payload: dict[str, Any], tools: Sequence[dict[str, Any]] | None = None) -> bytes:
+    """JSON request body as UTF-8 bytes (sent with content=); the cached tools array is spliced in."""
+    body = json.dumps(payload, ensure_ascii=False).encode()
+    if not tools:
+        return body
+    return b"".join((body[:-1], b', "tools": ', _tools_json_bytes(tools), b"}"))
+
+
+def extract_tool_calls(response: Any) -> list[dict[str, Any]]:
+    """tool_calls of a chat_completion() choice ([] when absent or malformed)."""
+    message = response.get("message", response) if isinstance(response, dict) else None
+    tool_calls = message.get("tool_calls") if isinstance(message, dict) else None
+    return tool_calls if isinstance(tool_calls, list) else []
+
+
 async def test_connection(
     *,
     base_url: str,
@@ -79,7 +111,7 @@ def _agent_params(
 
 async def chat_completion(
     messages: list[dict[str, Any]],
-    tools: list[dict[str, Any]] | None = None,
+    tools: Sequence[dict[str, Any]] | None = None,
     *,
     tool_choice: str | dict[str, Any] | None = None,
     base_url: str | None = None,
@@ -108,7 +140,6 @@ async def chat_completion(
         "top_p": params["top_p"],
     }
     if tools:
-        payload["tools"] = tools
         payload["tool_choice"] = tool_choice if tool_choice is not None else "auto"
 
     headers: dict[str, str] = {"Content-Type": "application/json"}
@@ -128,7 +159,7 @@ async def chat_completion(
     )
 
     async with httpx.AsyncClient(timeout=120.0) as client:
-        resp = await client.post(url, json=payload, headers=headers)
+        resp = await client.post(url, content=_encode_body(payload, tools), headers=headers)
         body = resp.text
         logger.info(
             "chat_completion: response",
@@ -141,7 +172,7 @@ async def chat_completion(
         )
 
         resp.raise_for_status()
-        data = resp.json()
+        data = json.loads(resp.content)
         choice = data.get("choices")
         if not choice:
             logger.error(
@@ -159,9 +190,15 @@ async def chat_completion(
         return choice[0]
 
 
+# chat_completion_stream events: ("content", delta) and ("tool", index, id, name, arguments_chunk)
+StreamContent = tuple[Literal["content"], str]
+StreamToolDelta = tuple[Literal["tool"], int, str | None, str, str]
+StreamEvent = StreamContent | StreamToolDelta
+
+
 async def chat_completion_stream(
     messages: list[dict[str, Any]],
-    tools: list[dict[str, Any]] | None = None,
+    tools: Sequence[dict[str, Any]] | None = None,
     *,
     base_url: str | None = None,
     model: str | None = None,
@@ -170,8 +207,8 @@ async def chat_completion_stream(
     frequency_penalty: float | None = None,
     top_p: float | None = None,
     max_tokens: int | None = None,
-) -> AsyncGenerator[dict[str, Any], None]:
-    """Stream chat completion. Yields delta chunks and tool_calls when complete."""
+) -> AsyncGenerator[StreamEvent, None]:
+    """Stream chat completion. Yields StreamContent and StreamToolDelta tuples."""
     params = _agent_params(
         base_url=base_url,
         model=model,
@@ -191,7 +228,6 @@ async def chat_completion_stream(
         "stream": True,
     }
     if tools:
-        payload["tools"] = tools
         payload["tool_choice"] = "auto"
 
     headers: dict[str, str] = {"Content-Type": "application/json"}
@@ -200,7 +236,7 @@ async def chat_completion_stream(
 
     url = f"{params['base_url'].rstrip('/')}/chat/completions"
     async with httpx.AsyncClient(timeout=120.0) as client:
-        async with client.stream("POST", url, json=payload, headers=headers) as resp:
+        async with client.stream("POST", url, content=_encode_body(payload, tools), headers=headers) as resp:
             resp.raise_for_status()
             buffer = ""
             async for chunk in resp.aiter_bytes():
@@ -223,7 +259,7 @@ async def chat_completion_stream(
                     delta = choices[0].get("delta", {})
                     content = delta.get("content")
                     if content:
-                        yield {"type": "content_delta", "delta": content}
+                        yield ("content", content)
                     tool_calls = delta.get("tool_calls")
                     if tool_calls:
                         for tc in tool_calls:
@@ -232,10 +268,4 @@ async def chat_completion_stream(
                                 name = fn.get("name") or ""
                                 args_chunk = fn.get("arguments") or ""
                                 if name or args_chunk:
-                                    yield {
-                                        "type": "tool_call",
-                                        "index": tc.get("index", 0),
-                                        "id": tc.get("id", ""),
-                                        "name": name,
-                                        "arguments": args_chunk,
-                                    }
+                                    yield ("tool", tc.get("index", 0), tc.get("id", ""), name, args_chunk)
@@ -92,4 +92,4 @@ async def restore_version(
         note = note_result.scalar_one_or_none()
         if note:
             from datetime import datetime, timezone
-            note.updated_at = datetime.now(timezone.utc).replace(tzinfo=None)
+            note.updated_at = datetime.now(timezone.utc)
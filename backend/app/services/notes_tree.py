@@ -19,9 +19,11 @@ async def get_notes_tree(db: AsyncSession, user_id: int) -> FolderTreeResponse:
     folders = list(result.scalars().all())
 
     notes_result = await db.execute(
-        select(Note).where(Note.user_id == user_id, Note.deleted_at.is_(None))
+        select(Note.id, Note.folder_id, Note.title, Note.pinned, Note.updated_at)
+        .where(Note.user_id == user_id, Note.deleted_at.is_(None))
+        .order_by(Note.updated_at.desc())
     )
-    notes = notes_result.scalars().all()
+    notes = notes_result.all()
 
     folder_map: dict[int, FolderTree] = {}
     for f in folders:
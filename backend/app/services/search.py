@@ -1,8 +1,12 @@
 """Hybrid search (BM25 + vector) via Redis Stack. Index notes for search."""
 
+import hashlib
 import logging
 import re
 import struct
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import Any
 
 import redis
@@ -10,13 +14,16 @@ from redis.commands.search.field import TagField, TextField, VectorField
 from redis.commands.search.index_definition import IndexDefinition, IndexType
 
 from app.config import settings
-from app.services.embeddings import EMBEDDING_DIMS, embed
+from app.services.embeddings import EMBEDDING_DIMS, EMBEDDING_MODEL, embed, embed_many
 
 logger = logging.getLogger(__name__)
 
 INDEX_NAME = "notes_search"
 KEY_PREFIX = "note_doc"
 RRF_K = 60
+EMBED_PREFIX_CHARS = 8000
+CONTENT_MAX_CHARS = 50000
+REINDEX_BATCH = 256
 
 
 def _get_redis() -> redis.Redis:
@@ -61,25 +68,130 @@ def ensure_index_exists(r: redis.Redis) -> None:
     logger.info("Created Redis search index: %s", INDEX_NAME)
 
 
+def _content_digest(title: str, content: str) -> bytes:
+    """Fingerprint of what index_note stores; includes the model so a model switch forces re-embedding."""
+    h = hashlib.blake2b(digest_size=16)
+    for part in (EMBEDDING_MODEL, title or "", content or ""):
+        h.update(part.encode("utf-8", errors="surrogatepass"))
+        h.update(b"\x00")
+    return h.digest()
+
+
 def index_note(user_id: int, note_id: int, title: str, content: str) -> None:
-    """Index or reindex a single note."""
+    """Index or reindex a single note. No-op when the stored document already has this title and content."""
+    index_notes([(user_id, note_id, title, content)])
+
+
+def index_notes(notes: list[tuple[int, int, str, str]]) -> int:
+    """Batch index_note. Each item: (user_id, note_id, title, content). Returns how many were (re)written.
+
+    One pipelined digest check, one batched embedding pass for the changed notes, one pipelined write.
+    """
+    if not notes:
+        return 0
     r = _get_redis()
     ensure_index_exists(r)
 
+    pipe = r.pipeline(transaction=False)
+    for user_id, note_id, _, _ in notes:
+        pipe.hget(_doc_key(user_id, note_id), "digest")
+    stored = pipe.execute()
+    changed = [
+        (note, digest)
+        for note, prev in zip(notes, stored)
+        if (digest := _content_digest(note[2], note[3])) != prev
+    ]
+    if not changed:
+        return 0
+
+    vectors = embed_many([f"{title}\n{content}"[:EMBED_PREFIX_CHARS] for (_, _, title, content), _ in changed])
+    pipe = r.pipeline(transaction=False)
+    for ((user_id, note_id, title, content), digest), embedding in zip(changed, vectors):
+        pipe.hset(
+            _doc_key(user_id, note_id),
+            mapping={
+                "user_id": str(user_id),
+                "note_id": str(note_id),
+                "title": (title[:500] if title else ""),
+                "content": (content[:CONTENT_MAX_CHARS] if content else ""),
+                "embedding": struct.pack(f"<{len(embedding)}f", *embedding),
+                "digest": digest,
+            },
+        )
+    pipe.execute()
+    return len(changed)
+
+
+def append_to_index(user_id: int, note_id: int, title: str, content: str, prev_len: int) -> None:
+    """Reindex after content[prev_len:] was appended. Skips re-embedding when the embedded prefix is unchanged."""
+    if len(title or "") + 1 + prev_len < EMBED_PREFIX_CHARS:
+        index_note(user_id, note_id, title, content)
+        return
+    r = _get_redis()
     key = _doc_key(user_id, note_id)
-    embedding = embed(f"{title}\n{content}"[:8000])
-    vec_bytes = struct.pack(f"<{len(embedding)}f", *embedding)
-
-    r.hset(
-        key,
-        mapping={
-            "user_id": str(user_id),
-            "note_id": str(note_id),
-            "title": (title[:500] if title else ""),
-            "content": (content[:50000] if content else ""),
-            "embedding": vec_bytes,
-        },
-    )
+    if not r.hexists(key, "embedding"):
+        index_note(user_id, note_id, title, content)
+        return
+    mapping: dict[str, Any] = {"digest": _content_digest(title, content)}
+    if prev_len < CONTENT_MAX_CHARS:
+        mapping["content"] = content[:CONTENT_MAX_CHARS]
+    r.hset(key, mapping=mapping)
+
+
+# (user_id, note_id) -> (title, content, prev_len); prev_len None means full reindex
+_PendingIndex = dict[tuple[int, int], tuple[str, str, int | None]]
+_PENDING: ContextVar[_PendingIndex | None] = ContextVar("search_pending", default=None)
+
+
+def schedule_index(user_id: int, note_id: int, title: str, content: str, prev_len: int | None = None) -> None:
+    """index_note / append_to_index, deferred to flush_index() while deferred_indexing() is active."""
+    pending = _PENDING.get()
+    if pending is None:
+        if prev_len is None:
+            index_note(user_id, note_id, title, content)
+        else:
+            append_to_index(user_id, note_id, title, content, prev_len)
+        return
+    key = (user_id, note_id)
+    if key in pending:
+        # Keep the earliest append offset: everything after it is new since the last real index write
+        first = pending[key][2]
+        prev_len = None if first is None or prev_len is None else min(first, prev_len)
+    pending[key] = (title, content, prev_len)
+
+
+@contextmanager
+def deferred_indexing() -> Iterator[_PendingIndex]:
+    """Collect schedule_index() calls in this context; the caller flushes (or drops) them."""
+    pending: _PendingIndex = {}
+    token = _PENDING.set(pending)
+    try:
+        yield pending
+    finally:
+        _PENDING.reset(token)
+
+
+def flush_index(pending: _PendingIndex) -> None:
+    """One index write per note with its final content; full reindexes go out as one batch. Failures are logged, not raised."""
+    full: list[tuple[int, int, str, str]] = []
+    for (user_id, note_id), (title, content, prev_len) in pending.items():
+        if prev_len is None:
+            full.append((user_id, note_id, title, content))
+            continue
+        try:
+            append_to_index(user_id, note_id, title, content, prev_len)
+        except Exception as e:
+            logger.warning("flush_index: index write failed", extra={"note_id": note_id, "error": str(e)}, exc_info=True)
+    if full:
+        try:
+            index_notes(full)
+        except Exception as e:
+            logger.warning(
+                "flush_index: batch index write failed",
+                extra={"note_ids": [n[1] for n in full], "error": str(e)},
+                exc_info=True,
+            )
+    pending.clear()
 
 
 def delete_note(user_id: int, note_id: int) -> None:
@@ -91,11 +203,9 @@ def delete_note(user_id: int, note_id: int) -> None:
 
 def reindex_notes_sync(notes: list[tuple[int, int, str, str]]) -> int:
     """Reindex notes. Each item: (user_id, note_id, title, content). Returns count."""
-    count = 0
-    for user_id, note_id, title, content in notes:
-        index_note(user_id, note_id, title, content)
-        count += 1
-    return count
+    for start in range(0, len(notes), REINDEX_BATCH):
+        index_notes(notes[start : start + REINDEX_BATCH])
+    return len(notes)
 
 
 def _rrf_score(rank: int) -> float:
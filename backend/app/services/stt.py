@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import os
 import tempfile
@@ -12,6 +13,7 @@ logger = logging.getLogger(__name__)
 COMPUTE_TYPE: Literal["int8", "float16", "float32"] = "int8"
 
 _model: WhisperModel | None = None
+_load_lock = asyncio.Lock()
 
 
 def load_model() -> None:
@@ -36,11 +38,20 @@ def unload_model() -> None:
         logger.info("STT model unloaded")
 
 
-async def transcribe(audio_bytes: bytes, language: str | None = None) -> str:
+async def _get_model() -> WhisperModel | None:
+    """Loaded on first use (in a thread; concurrent first requests share one load)."""
     if _model is None:
-        load_model()
-        if _model is None:
-            return ""
+        async with _load_lock:
+            if _model is None:
+                await asyncio.to_thread(load_model)
+    return _model
+
+
+async def transcribe(audio_bytes: bytes, language: str | None = None) -> str:
+    # Local ref: the idle-unload task may drop the global while we transcribe
+    model = await _get_model()
+    if model is None:
+        return ""
 
     with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as f:
         f.write(audio_bytes)
@@ -48,7 +59,7 @@ async def transcribe(audio_bytes: bytes, language: str | None = None) -> str:
 
     try:
         lang = language or settings.whisper_language or None
-        segments, _ = _model.transcribe(
+        segments, _ = model.transcribe(
             audio_path,
             language=lang,
             word_timestamps=False,
@@ -63,8 +74,6 @@ async def transcribe(audio_bytes: bytes, language: str | None = None) -> str:
 
 
 def start_idle_unload_task():
-    import asyncio
-
     async def task():
         while True:
             await asyncio.sleep(300)  # 5 minutes